@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Workflow Job Queue
+
+Pluggable queue that spreads orchestrate.py phases over worker processes on
+one machine or several. Jobs are leased: a worker claims a job for
+lease_seconds and heartbeats to keep it. When a lease expires (the worker
+died or hung), the job goes back to the queue for another worker, up to
+max_attempts attempts. Expired leases are applied on every claim and by
+reap(), which a submitter calls while waiting so that jobs whose workers
+are all gone still fail. Results are stored with the job until the
+submitter collects them.
+
+Backends are picked by URL scheme (QUEUE_BACKENDS). The built-in sqlite
+backend (sqlite:///path/to/queue.db, or a plain path) needs no broker and is
+safe for concurrent processes sharing the file.
+
+Usage:
+    python job_queue.py sqlite:///tmp/workflow-queue.db stats
+    python job_queue.py /tmp/workflow-queue.db list --status failed
+
+Output: JSON
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs(status, kind, id);
+"""
+
+# Job statuses: queued -> running -> done | failed (running -> queued on retry)
+TERMINAL_STATUSES = ("done", "failed")
+
+class JobQueue(ABC):
+    """Interface of queue backends.
+
+    Jobs are dicts with id, kind, payload (JSON-serializable), status,
+    attempts, and once finished result or error.
+    """
+
+    @abstractmethod
+    def submit(self, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> int:
+        pass
+
+    @abstractmethod
+    def claim(self, worker: str, kinds: List[str], lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Lease the oldest available job of the given kinds, None if there is none."""
+
+    @abstractmethod
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float) -> bool:
+        """Extend a lease; False if the worker lost it (expired and reclaimed)."""
+
+    @abstractmethod
+    def complete(self, job_id: int, worker: str, result: Dict[str, Any]) -> bool:
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """Give a job back for retry, or fail it once its attempts are used up."""
+
+    @abstractmethod
+    def cancel(self, job_id: int, error: str) -> bool:
+        """Fail a job no worker has claimed; False if it is running or finished."""
+
+    @abstractmethod
+    def reap(self) -> int:
+        """Requeue jobs whose lease expired, or fail them once their attempts
+        are used up; returns how many were changed."""
+
+    @abstractmethod
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        pass
+
+    def close(self):
+        pass
+
+class SQLiteJobQueue(JobQueue):
+    def __init__(self, path: str):
+        self.path = path
+        # sqlite3 connections must not be shared between threads
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def submit(self, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> int:
+        now = time.time()
+        return self._connect().execute(
+            "INSERT INTO jobs (kind, payload, status, max_attempts, created_at, updated_at) "
+            "VALUES (?, ?, 'queued', ?, ?, ?)",
+            (kind, json.dumps(payload), max(1, max_attempts), now, now)
+        ).lastrowid
+
+    def claim(self, worker: str, kinds: List[str], lease_seconds: float) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        now = time.time()
+        placeholders = ", ".join("?" for _ in kinds)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._reap(conn, now)
+            row = conn.execute(
+                f"SELECT id FROM jobs WHERE kind IN ({placeholders}) AND status = 'queued' ORDER BY id LIMIT 1",
+                kinds
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (worker, now + lease_seconds, now, row[0])
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row[0])
+
+    def reap(self) -> int:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            changed = self._reap(conn, time.time())
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return changed
+
+    def _reap(self, conn: sqlite3.Connection, now: float) -> int:
+        # Expired leases whose attempts are used up are failed, the others retried
+        failed = conn.execute(
+            "UPDATE jobs SET status = 'failed', error = 'lease expired', worker = NULL, updated_at = ? "
+            "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+            (now, now)
+        ).rowcount
+        requeued = conn.execute(
+            "UPDATE jobs SET status = 'queued', error = 'lease expired', worker = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE status = 'running' AND lease_expires < ?",
+            (now, now)
+        ).rowcount
+        return failed + requeued
+
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float) -> bool:
+        now = time.time()
+        return self._connect().execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (now + lease_seconds, now, job_id, worker)
+        ).rowcount == 1
+
+    def complete(self, job_id: int, worker: str, result: Dict[str, Any]) -> bool:
+        return self._connect().execute(
+            "UPDATE jobs SET status = 'done', result = ?, worker = NULL, updated_at = ? "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (json.dumps(result), time.time(), job_id, worker)
+        ).rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        return self._connect().execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END, "
+            "error = ?, worker = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (error, time.time(), job_id, worker)
+        ).rowcount == 1
+
+    def cancel(self, job_id: int, error: str) -> bool:
+        return self._connect().execute(
+            "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ? AND status = 'queued'",
+            (error, time.time(), job_id)
+        ).rowcount == 1
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT id, kind, payload, status, attempts, max_attempts, worker, result, error FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        return _job(row) if row else None
+
+    def jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = "SELECT id, kind, payload, status, attempts, max_attempts, worker, result, error FROM jobs"
+        rows = self._connect().execute(
+            query + (" WHERE status = ? ORDER BY id" if status else " ORDER BY id"), (status,) if status else ()
+        ).fetchall()
+        return [_job(row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+def _job(row: tuple) -> Dict[str, Any]:
+    job_id, kind, payload, status, attempts, max_attempts, worker, result, error = row
+    return {
+        "id": job_id,
+        "kind": kind,
+        "payload": json.loads(payload),
+        "status": status,
+        "attempts": attempts,
+        "max_attempts": max_attempts,
+        "worker": worker,
+        "result": json.loads(result) if result else None,
+        "error": error
+    }
+
+# URL scheme -> backend class taking the rest of the URL
+QUEUE_BACKENDS = {
+    "sqlite": SQLiteJobQueue
+}
+
+def open_queue(url: str) -> JobQueue:
+    """Queue for a URL such as sqlite:///tmp/queue.db (a plain path means sqlite)."""
+    scheme, separator, location = url.partition("://")
+    if not separator:
+        return SQLiteJobQueue(url)
+    backend = QUEUE_BACKENDS.get(scheme)
+    if backend is None:
+        raise ValueError(f"Unknown queue backend: {scheme} (available: {', '.join(sorted(QUEUE_BACKENDS))})")
+    # sqlite:///abs/path -> /abs/path, sqlite://rel/path -> rel/path
+    return backend(location)
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a workflow job queue")
+    parser.add_argument("queue", help="Queue URL (sqlite:///path/to/queue.db or a path)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Job counts by status")
+    list_cmd = commands.add_parser("list", help="List jobs")
+    list_cmd.add_argument("--status", choices=["queued", "running", "done", "failed"], help="Only jobs in this status")
+
+    args = parser.parse_args()
+
+    try:
+        queue = open_queue(args.queue)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not isinstance(queue, SQLiteJobQueue):
+        print("Error: Inspection is only supported for the sqlite backend", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        output: Any = queue.stats() if args.command == "stats" else queue.jobs(args.status)
+    finally:
+        queue.close()
+
+    # Output as JSON
+    print(json.dumps(output, indent=2))
+
+if __name__ == "__main__":
+    main()
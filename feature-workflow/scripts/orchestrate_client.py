@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Feature Workflow Client
+
+Thin client for the orchestrate.py daemon (orchestrate.py --serve): sends
+its command line to the daemon's Unix socket as a job and prints the
+streamed output. It parses no arguments and loads no config itself, so a
+call costs little more than interpreter startup. When no daemon is
+listening, it runs orchestrate.py directly with the same arguments.
+
+Usage:
+    python orchestrate_client.py [--socket PATH] [--json] [orchestrate.py options]
+    python orchestrate_client.py --phases research,plan --features auth
+
+Options (consumed by the client, everything else goes to the daemon):
+    --socket PATH   Daemon socket (default: $FEATURE_WORKFLOW_SOCKET or
+                    /tmp/feature-workflow-<uid>.sock)
+    --json          Print every workflow event as a JSON line instead of
+                    the console output
+
+Exit code: 1 if the daemon rejected the job or the workflow failed, 0
+otherwise (like orchestrate.py)
+"""
+
+import os
+import sys
+import json
+import socket
+
+def main():
+    argv = sys.argv[1:]
+    socket_path = os.environ.get(
+        "FEATURE_WORKFLOW_SOCKET", f"/tmp/feature-workflow-{os.getuid() if hasattr(os, 'getuid') else 0}.sock"
+    )
+    as_json = False
+    if "--socket" in argv:
+        index = argv.index("--socket")
+        if index + 1 >= len(argv):
+            print("Error: --socket needs a path", file=sys.stderr)
+            sys.exit(1)
+        socket_path = argv[index + 1]
+        del argv[index:index + 2]
+    if "--json" in argv:
+        argv.remove("--json")
+        as_json = True
+
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+    except (OSError, AttributeError):
+        # No daemon: run the workflow in this process
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "orchestrate.py")
+        os.execv(sys.executable, [sys.executable, script] + argv)
+
+    request = {"argv": argv, "cwd": os.getcwd(), "events": as_json}
+    conn.sendall((json.dumps(request) + "\n").encode('utf-8'))
+
+    exit_code = 1
+    for line in conn.makefile('r', encoding='utf-8'):
+        message = json.loads(line)
+        if message["event"] == "job_finished":
+            exit_code = message.get("exit_code", 0)
+            if message.get("error"):
+                print(f"Error: {message['error']}", file=sys.stderr)
+            if as_json:
+                print(line, end="", flush=True)
+            break
+        if as_json:
+            if message["event"] != "output":
+                print(line, end="", flush=True)
+        elif message["event"] == "output":
+            print(message["text"], flush=True)
+    conn.close()
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
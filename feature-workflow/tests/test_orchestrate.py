@@ -0,0 +1,213 @@
+"""Tests for scripts/orchestrate.py (run with: python -m unittest discover feature-workflow/tests)."""
+
+import io
+import os
+import json
+import socket
+import sys
+import time
+import tempfile
+import unittest
+import threading
+import subprocess
+from contextlib import redirect_stderr
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from job_queue import SQLiteJobQueue  # noqa: E402
+from orchestrate import WorkflowDaemon, WorkflowOrchestrator, _default_config, _merge_config  # noqa: E402
+
+class WorkflowTestCase(unittest.TestCase):
+    """Runs each test in an empty working directory."""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._directory = tempfile.TemporaryDirectory()
+        os.chdir(self._directory.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._directory.cleanup()
+
+    def orchestrator(self, **overrides) -> WorkflowOrchestrator:
+        self.events = []
+        config = _merge_config(_default_config(), overrides)
+        return WorkflowOrchestrator(config, console=self.events.append)
+
+class CheckpointTest(WorkflowTestCase):
+    def test_resume_from_a_corrupt_checkpoint_starts_fresh(self):
+        Path(".workflow-state.json").write_text("{not json")
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            orchestrator = self.orchestrator(workflow={"phases": ["research"], "resume": True})
+
+        self.assertIn("Ignoring unreadable checkpoint", stderr.getvalue())
+        self.assertTrue(orchestrator.run())
+        self.assertEqual(orchestrator.state["features"][""]["resumed_phases"], [])
+
+class ArtifactCacheTest(WorkflowTestCase):
+    def test_features_with_identical_inputs_keep_their_own_outputs(self):
+        orchestrator = self.orchestrator(workflow={"phases": ["research"], "features": ["auth", "billing"]})
+
+        def research(feature):
+            Path(feature).mkdir(exist_ok=True)
+            Path(feature, "findings.md").write_text(f"findings for {feature}\n")
+            return True
+        orchestrator.handlers["research"] = research
+
+        self.assertTrue(orchestrator.run())
+        self.assertEqual(Path("auth/findings.md").read_text(), "findings for auth\n")
+        self.assertEqual(Path("billing/findings.md").read_text(), "findings for billing\n")
+        self.assertEqual(orchestrator.cache_stats["hits"], 0)
+
+class FixLoopTest(WorkflowTestCase):
+    def test_failing_tests_are_fixed_then_retested(self):
+        orchestrator = self.orchestrator(workflow={"phases": ["test", "fix"]})
+        # Test phase run, targeted retest after the fix, confirming full run
+        results = [["test_login"], [], []]
+        selections = []
+
+        def execute_tests(feature, selection=None):
+            selections.append(selection)
+            return results.pop(0)
+        orchestrator._execute_tests = execute_tests
+
+        self.assertTrue(orchestrator.run())
+        feature_state = orchestrator.state["features"][""]
+        self.assertEqual(feature_state["completed_phases"], ["test", "fix"])
+        self.assertEqual(feature_state["blocked_phases"], [])
+        self.assertEqual(feature_state["failing_tests"], [])
+        self.assertEqual(selections, [None, {"tests": ["test_login"], "files": []}, None])
+
+    def test_failing_tests_fail_the_test_phase_without_fix(self):
+        orchestrator = self.orchestrator(workflow={"phases": ["test"]})
+        orchestrator._execute_tests = lambda feature, selection=None: ["test_login"]
+
+        self.assertFalse(orchestrator.run())
+        self.assertEqual(orchestrator.state["features"][""]["failed_phases"], ["test"])
+
+class ParallelImplementationTest(WorkflowTestCase):
+    PLAN = """# Implementation Plan: Forms
+
+## Phase 1: Entities
+- [ ] **Step 1.1**: Create User entity (no dependencies)
+- [ ] **Step 1.2**: Create Form entity (no dependencies)
+
+## Phase 2: API
+**Dependencies**: All previous phases
+- [ ] **Step 2.1**: Users endpoint
+- [ ] **Step 2.2**: Forms endpoint
+  - **Dependencies**: None
+"""
+
+    def implement(self, plan: str) -> list:
+        """Run parallel implementation of a plan; returns ("start" | "end", step id) events."""
+        for command in (["init", "-q", "-b", "main"], ["commit", "-q", "--allow-empty", "-m", "initial"]):
+            subprocess.run(["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"] + command,
+                           check=True)
+        Path("Plan.md").write_text(plan)
+        orchestrator = self.orchestrator(
+            workflow={"phases": ["implement"], "parallel_implementation": True},
+            implementation={"max_parallel_steps": 4}
+        )
+        log = []
+
+        def implement_step(feature, step, repo_root, base_branch):
+            log.append(("start", step.id))
+            time.sleep(0.05)
+            log.append(("end", step.id))
+            return True
+        orchestrator._implement_step = implement_step
+
+        self.assertTrue(orchestrator.run())
+        self.assertEqual(sorted(step_id for event, step_id in log if event == "end"), ["1.1", "1.2", "2.1", "2.2"])
+        return log
+
+    def test_steps_follow_the_plan_graph(self):
+        log = self.implement(self.PLAN)
+
+        for step_id in ("2.1", "2.2"):
+            for dependency in ("1.1", "1.2"):
+                self.assertLess(log.index(("end", dependency)), log.index(("start", step_id)))
+
+    def test_plan_with_dangling_references_runs_in_plan_order(self):
+        log = self.implement(self.PLAN.replace("**Dependencies**: None", "**Dependencies**: Step 9.1"))
+
+        self.assertEqual(log, [(event, step_id) for step_id in ("1.1", "1.2", "2.1", "2.2")
+                               for event in ("start", "end")])
+        messages = [event["text"] for event in self.events if event["event"] == "message"]
+        self.assertIn("  ⚠️  2.2 depends on Step 9.1 (line 11), which is not in the plan", messages)
+
+class DistributedModeTest(WorkflowTestCase):
+    def test_phase_without_workers_fails_after_claim_timeout(self):
+        orchestrator = self.orchestrator(workflow={
+            "phases": ["research"], "queue": "sqlite://queue.db", "queue_claim_timeout": 1
+        })
+
+        self.assertFalse(orchestrator.run())
+        self.assertEqual(SQLiteJobQueue("queue.db").get(1)["status"], "failed")
+
+    def test_phase_fails_when_its_worker_dies(self):
+        orchestrator = self.orchestrator(workflow={
+            "phases": ["research"], "queue": "sqlite://queue.db", "queue_max_attempts": 1
+        })
+
+        def dead_worker():
+            # Claims the job with a short lease, then never heartbeats or completes it
+            queue = SQLiteJobQueue("queue.db")
+            deadline = time.monotonic() + 5
+            while queue.claim("dead", ["phase"], 0.2) is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+        worker = threading.Thread(target=dead_worker)
+        worker.start()
+
+        started = time.monotonic()
+        self.assertFalse(orchestrator.run())
+        worker.join()
+        self.assertLess(time.monotonic() - started, 5)
+        job = SQLiteJobQueue("queue.db").get(1)
+        self.assertEqual((job["status"], job["error"]), ("failed", "lease expired"))
+
+class DaemonTest(WorkflowTestCase):
+    CYCLIC_PLAN = """# Plan
+
+## Phase 1: Core
+
+- [ ] **Step 1.1**: Models
+  - **Dependencies**: Step 1.2
+- [ ] **Step 1.2**: Views
+  - **Dependencies**: Step 1.1
+"""
+
+    def run_job(self, request):
+        daemon = WorkflowDaemon(os.path.join(os.getcwd(), "daemon.sock"))
+        server, client = socket.socketpair()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.sendall((json.dumps(request) + "\n").encode('utf-8'))
+        try:
+            daemon._handle(server, listener)
+            with client.makefile('r', encoding='utf-8') as replies:
+                messages = [json.loads(line) for line in replies]
+        finally:
+            client.close()
+            listener.close()
+            daemon._reap(block=True)
+        return messages[-1]
+
+    def test_failed_workflow_exits_non_zero(self):
+        Path("Plan.md").write_text(self.CYCLIC_PLAN)
+        finished = self.run_job({
+            "argv": ["--phases", "implement"], "cwd": os.getcwd(),
+            "config": {"workflow": {"parallel_implementation": True}}
+        })
+
+        self.assertEqual((finished["event"], finished["status"], finished["exit_code"]), ("job_finished", "failed", 1))
+
+    def test_completed_workflow_exits_zero(self):
+        finished = self.run_job({"argv": ["--phases", "research"], "cwd": os.getcwd()})
+
+        self.assertEqual((finished["status"], finished["exit_code"]), ("completed", 0))
+
+if __name__ == "__main__":
+    unittest.main()
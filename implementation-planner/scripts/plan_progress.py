@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Plan Progress Index
+
+SQLite index of checkbox progress across many implementation plans: per
+plan and per phase, the number of checkboxes and how many are checked.
+Plans are parsed with validate_plan.py's parser. Updates are incremental:
+a plan whose mtime and size are unchanged is not read, one whose content
+hash is unchanged is not parsed again, and plans that no longer exist are
+dropped. Portfolio queries then read the index only.
+
+A plan's progress time is when its checked count last changed (its file
+mtime when first indexed), so plans whose checkboxes have not moved for a
+while show up as stalled.
+
+Usage:
+    python plan_progress.py .plan-progress.db update features/ [--name Plan.md]
+    python plan_progress.py .plan-progress.db summary
+    python plan_progress.py .plan-progress.db plans [--under features/auth]
+    python plan_progress.py .plan-progress.db stalled --days 14
+    python plan_progress.py .plan-progress.db phases
+
+Output: JSON query results
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from typing import Dict, List, Any, Optional, Tuple
+
+from validate_plan import Plan, expand_paths, parse_plan
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    title TEXT,
+    total INTEGER NOT NULL,
+    checked INTEGER NOT NULL,
+    phase_count INTEGER NOT NULL,
+    indexed_at REAL NOT NULL,
+    progress_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS phases (
+    plan_path TEXT NOT NULL REFERENCES plans(path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT,
+    line INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    checked INTEGER NOT NULL,
+    PRIMARY KEY (plan_path, position)
+);
+CREATE INDEX IF NOT EXISTS plans_by_progress ON plans(progress_at);
+"""
+
+# Upper bounds (inclusive, in percent) of the phase completion buckets
+COMPLETION_BUCKETS = [(0, "0%"), (24, "1-24%"), (49, "25-49%"), (74, "50-74%"), (99, "75-99%"), (100, "100%")]
+
+def plan_counts(plan: Plan) -> Tuple[int, int, List[Tuple[int, int, str, int, int, int]]]:
+    """(total, checked, phase rows) of a parsed plan.
+
+    Only list item checkboxes count. The plan totals are the sums over its
+    phases, so a progress tracker that repeats the phases is not counted
+    twice; a plan without phases counts all of its checkboxes.
+    """
+    rows = []
+    for position, phase in enumerate(plan.phases):
+        boxes = [checkbox for checkbox in phase.checkboxes if checkbox.list_item]
+        rows.append((position, phase.number, phase.title, phase.line, len(boxes),
+                     sum(1 for checkbox in boxes if checkbox.checked)))
+    if rows:
+        return sum(row[4] for row in rows), sum(row[5] for row in rows), rows
+    boxes = [checkbox for checkbox in plan.checkboxes if checkbox.list_item]
+    return len(boxes), sum(1 for checkbox in boxes if checkbox.checked), rows
+
+def _percent(checked: int, total: int) -> float:
+    return round(100.0 * checked / total, 1) if total else 0.0
+
+class ProgressIndex:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def update(self, paths: List[str]) -> Dict[str, int]:
+        """Index plan files; returns how many were parsed, unchanged and removed.
+
+        Indexed plans whose file no longer exists are removed.
+        """
+        known = {
+            path: (mtime_ns, size, digest, checked)
+            for path, mtime_ns, size, digest, checked in self.conn.execute(
+                "SELECT path, mtime_ns, size, hash, checked FROM plans"
+            )
+        }
+        counts = {"parsed": 0, "unchanged": 0, "removed": 0, "missing": 0}
+        now = time.time()
+
+        with self.conn:
+            for path in (os.path.abspath(path) for path in paths):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    counts["missing"] += 1
+                    continue
+                previous = known.get(path)
+                if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                    counts["unchanged"] += 1
+                    continue
+
+                with open(path, 'rb') as f:
+                    data = f.read()
+                digest = hashlib.sha256(data).hexdigest()
+                if previous and previous[2] == digest:
+                    # Touched or rewritten with the same content
+                    self.conn.execute("UPDATE plans SET mtime_ns = ?, size = ? WHERE path = ?",
+                                      (stat.st_mtime_ns, stat.st_size, path))
+                    counts["unchanged"] += 1
+                    continue
+
+                plan = parse_plan(data.decode('utf-8', errors='replace'), path)
+                total, checked, phase_rows = plan_counts(plan)
+                progress_at = stat.st_mtime if previous is None else now
+                if previous and previous[3] == checked:
+                    # Edited, but no checkbox moved: keep the last progress time
+                    progress_at = self.conn.execute(
+                        "SELECT progress_at FROM plans WHERE path = ?", (path,)
+                    ).fetchone()[0]
+                self.conn.execute("DELETE FROM plans WHERE path = ?", (path,))
+                self.conn.execute(
+                    "INSERT INTO plans (path, mtime_ns, size, hash, title, total, checked, phase_count, "
+                    "indexed_at, progress_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, stat.st_mtime_ns, stat.st_size, digest, plan.title, total, checked,
+                     len(phase_rows), now, progress_at)
+                )
+                self.conn.executemany(
+                    "INSERT INTO phases (plan_path, position, number, title, line, total, checked) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(path,) + row for row in phase_rows]
+                )
+                counts["parsed"] += 1
+
+            for path in known:
+                if not os.path.exists(path):
+                    self.conn.execute("DELETE FROM plans WHERE path = ?", (path,))
+                    counts["removed"] += 1
+        return counts
+
+    def summary(self) -> Dict[str, Any]:
+        plans, total, checked, complete, started = self.conn.execute(
+            """
+            SELECT COUNT(*), COALESCE(SUM(total), 0), COALESCE(SUM(checked), 0),
+                   COALESCE(SUM(total > 0 AND checked = total), 0), COALESCE(SUM(checked > 0 AND checked < total), 0)
+            FROM plans
+            """
+        ).fetchone()
+        return {
+            "plans": plans,
+            "complete": complete,
+            "in_progress": started,
+            "not_started": plans - complete - started,
+            "checkboxes": total,
+            "checked": checked,
+            "percent": _percent(checked, total)
+        }
+
+    def plans(self, under: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Progress of every plan (optionally below a directory), least complete first."""
+        query = "SELECT path, title, total, checked, phase_count, progress_at FROM plans"
+        params: tuple = ()
+        if under:
+            prefix = os.path.join(os.path.abspath(under), "")
+            query += " WHERE substr(path, 1, ?) = ?"
+            params = (len(prefix), prefix)
+        rows = self.conn.execute(query + " ORDER BY CAST(checked AS REAL) / MAX(total, 1), path", params)
+        return [
+            {
+                "path": path,
+                "title": title,
+                "checked": checked,
+                "total": total,
+                "percent": _percent(checked, total),
+                "phases": phase_count,
+                "last_progress": _timestamp(progress_at)
+            }
+            for path, title, total, checked, phase_count, progress_at in rows
+        ]
+
+    def stalled(self, days: float = 14) -> List[Dict[str, Any]]:
+        """Unfinished plans whose checked count has not changed for days, oldest first,
+        with the first phase that still has unchecked boxes."""
+        now = time.time()
+        rows = self.conn.execute(
+            """
+            SELECT plans.path, plans.title, plans.total, plans.checked, plans.progress_at,
+                   (SELECT number || ': ' || COALESCE(title, '') FROM phases
+                    WHERE phases.plan_path = plans.path AND phases.checked < phases.total
+                    ORDER BY position LIMIT 1)
+            FROM plans
+            WHERE plans.checked < plans.total AND plans.progress_at < ?
+            ORDER BY plans.progress_at
+            """,
+            (now - days * 86400,)
+        )
+        return [
+            {
+                "path": path,
+                "title": title,
+                "checked": checked,
+                "total": total,
+                "percent": _percent(checked, total),
+                "last_progress": _timestamp(progress_at),
+                "idle_days": round((now - progress_at) / 86400, 1),
+                "current_phase": f"Phase {current}" if current else None
+            }
+            for path, title, total, checked, progress_at, current in rows
+        ]
+
+    def phases(self) -> Dict[str, Any]:
+        """Distribution of phase completion: buckets over all phases, and per
+        phase number how many plans have it not started, in progress or done."""
+        buckets = {label: 0 for _, label in COMPLETION_BUCKETS}
+        by_number: Dict[int, Dict[str, int]] = {}
+        for number, total, checked, phase_count in self.conn.execute(
+            "SELECT number, total, checked, COUNT(*) FROM phases GROUP BY number, total, checked"
+        ):
+            buckets[_bucket(checked, total)] += phase_count
+            state = "done" if total and checked == total else "in_progress" if checked else "not_started"
+            counts = by_number.setdefault(number, {"not_started": 0, "in_progress": 0, "done": 0})
+            counts[state] += phase_count
+        return {
+            "phases": sum(buckets.values()),
+            "completion": buckets,
+            "by_phase_number": [{"phase": number, **counts} for number, counts in sorted(by_number.items())]
+        }
+
+def _bucket(checked: int, total: int) -> str:
+    """Completion bucket; only untouched phases are 0% and only finished ones 100%."""
+    if not checked:
+        return COMPLETION_BUCKETS[0][1]
+    if checked >= total:
+        return COMPLETION_BUCKETS[-1][1]
+    percent = 100.0 * checked / total
+    return next(label for bound, label in COMPLETION_BUCKETS[1:-1] if percent <= bound or bound == 99)
+
+def _timestamp(seconds: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(seconds))
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and query implementation plan progress")
+    parser.add_argument("db", help="Path to the progress database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update_cmd = commands.add_parser("update", help="Index new and changed plans")
+    update_cmd.add_argument("paths", nargs="+", help="Plan files, directories or globs")
+    update_cmd.add_argument("--name", default="Plan.md",
+                            help="File name pattern searched for in directories (default: Plan.md)")
+
+    commands.add_parser("summary", help="Progress over all indexed plans")
+
+    plans_cmd = commands.add_parser("plans", help="Progress of each plan, least complete first")
+    plans_cmd.add_argument("--under", help="Only plans below this directory")
+
+    stalled_cmd = commands.add_parser("stalled", help="Unfinished plans without progress for a while")
+    stalled_cmd.add_argument("--days", type=float, default=14,
+                             help="Days without a checkbox change (default: 14)")
+
+    commands.add_parser("phases", help="Distribution of phase completion")
+
+    args = parser.parse_args()
+
+    index = ProgressIndex(args.db)
+    try:
+        if args.command == "update":
+            paths = expand_paths(args.paths, args.name)
+            if not paths:
+                print("Error: No plan files found", file=sys.stderr)
+                sys.exit(1)
+            output: Any = index.update(paths)
+        elif args.command == "summary":
+            output = index.summary()
+        elif args.command == "plans":
+            output = index.plans(args.under)
+        elif args.command == "stalled":
+            output = index.stalled(args.days)
+        else:
+            output = index.phases()
+    finally:
+        index.close()
+
+    # Output as JSON
+    print(json.dumps(output, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -5,193 +5,1180 @@ Implementation Plan Validator
 Validates the structure and completeness of implementation plans.
 Framework-agnostic: works with any project type.
 
+The plan is tokenized in a single pass over its lines into a plan model: title, headings, phases, steps, checkboxes with
+line numbers and dependency markers. Each check is a visitor over that
+model, so validation time is linear in the size of the plan.
+
+Several files, directories (searched recursively for --name, default
+Plan.md) and globs can be validated at once: files are validated in a
+process pool, unchanged files are skipped with --cache (by mtime and size,
+then content hash), and results can be written as JSON Lines or SARIF.
+
+--watch keeps one plan's model in memory and validates it again on every
+save (inotify, or polling where unavailable), re-parsing only the sections
+that changed.
+
+--schedule reads the plan's dependency declarations ("**Dependencies**:
+Step 1.2", "Depends on: Phase 1", "(no dependencies)") into a step graph
+and prints, instead of validating, a maximal-parallelism schedule: levels
+of steps that can run at once, earliest start and finish per step
+(weighted by "(~2h)" estimates when the plan has them) and the critical
+path. Validation reports dependency cycles and references to unknown steps
+or phases.
+
 Usage:
     python validate_plan.py <plan-file.md>
+    python validate_plan.py <file|directory|glob>... [--format text|jsonl|sarif] [--jobs N] [--cache FILE]
+    python validate_plan.py <plan-file.md> --schedule [--remaining]
 
 Example:
     python validate_plan.py Plan.md
     python validate_plan.py implementation-plan.md
+    python validate_plan.py features/ --format jsonl --cache .plan-validation-cache.json
+    python validate_plan.py 'features/*/Plan.md' --format sarif > plans.sarif
+    python validate_plan.py Plan.md --watch
+    python validate_plan.py Plan.md --schedule --remaining
+
+Exit code: 1 if any plan has errors, 0 otherwise
 """
 
+import os
 import sys
 import re
+import glob
+import json
+import fnmatch
+import ctypes
+import ctypes.util
+import hashlib
+import struct
+import time
+import select
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+CACHE_VERSION = 1
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+HEADING_RE = re.compile(r'(#{1,6})\s+(.*\S)')
+CHECKBOX_RE = re.compile(r'-\s+\[([x ])\]')
+# Estimates: "(~2h)", "Estimate: 1.5d", "**Estimated:** 2 hours", "**Effort**: 30min"
+ESTIMATE_RE = re.compile(
+    r'(?:~|\b(?:est(?:imated?)?|effort)\b\.?\**\s*:?\s*\**\s*~?)\s*(\d+(?:\.\d+)?)\s*(h|hrs?|hours?|d|days?|m|mins?|minutes?)\b',
+    re.IGNORECASE
+)
+# Dependency declarations: "**Dependencies**: Step 1.1", "- Depends on: Phase 1 complete",
+# and inline "(depends on Step 1 & 2)" / "(no dependencies)" in a step line
+# ("Requires:" lists prerequisites such as tools, not steps)
+DECLARATION_RE = re.compile(
+    r'^(?:[-*]\s+)?\**\s*(?:dependencies|dependency|depends\s+on|blocked\s+by|dépendances)\s*\**\s*:\s*\**\s*(.*)$',
+    re.IGNORECASE
+)
+INLINE_DECLARATION_RE = re.compile(r'\((no dependencies|(?:depends\s+on|blocked\s+by)\s+[^)]*)\)', re.IGNORECASE)
+PHASE_REFERENCE_RE = re.compile(r'Phase\s+(\d+)', re.IGNORECASE)
+# Step ids are "Step 3" / "Steps 1.1, 1.2 and 2" or dotted "1.2"; other numbers are not references
+STEP_LIST_RE = re.compile(
+    r'\b(?:Steps?|Étapes?)\s+(\d+(?:\.\d+)*(?:\s*(?:,|&|\+|\band\b|\bet\b)\s*\d+(?:\.\d+)*)*)', re.IGNORECASE
+)
+STEP_REFERENCE_RE = re.compile(r'\d+(?:\.\d+)*')
+DOTTED_STEP_RE = re.compile(r'(?<![\w.])\d+(?:\.\d+)+(?![\w.])')
+
+# Where parsing state resets: headings of level 1 or 2 (see IncrementalPlanParser)
+SECTION_START_RE = re.compile(r'^#{1,2}[^\S\n]+\S', re.MULTILINE)
+DEPENDENCY_MARKER_RE = re.compile(r'depends\s+on|dependencies|dépendances|requires|blocked\s+by', re.IGNORECASE)
+PHASE_HEADING_RE = re.compile(r'(Phase|Step|Étape)\s+(\d+)(?::?\s+(.+))?', re.IGNORECASE)
+STEP_RE = re.compile(r'\**\s*Step\s+(\d+(?:\.\d+)*)\s*:?\s*\**\s*:?\s*(.*)$', re.IGNORECASE)
+
+OVERVIEW_RE = re.compile(r'(Overview|Description|Vue d\'ensemble)', re.IGNORECASE)
+PROGRESS_RE = re.compile(r'(Progress|État d\'Avancement|Status)', re.IGNORECASE)
+CRITERIA_RE = re.compile(r'(Validation|Success|Acceptance)\s+Criteria', re.IGNORECASE)
+FRENCH_CRITERIA_RE = re.compile(r'Critères\s+de\s+(Validation|Succès)', re.IGNORECASE)
+
+class Heading:
+    __slots__ = ("level", "title", "line")
+
+    def __init__(self, level: int, title: str, line: int):
+        self.level = level
+        self.title = title
+        self.line = line
+
+class Checkbox:
+    """A checkbox; list_item is False when it does not start its line."""
+
+    __slots__ = ("line", "checked", "text", "list_item")
+
+    def __init__(self, line: int, checked: bool, text: str, list_item: bool):
+        self.line = line
+        self.checked = checked
+        self.text = text
+        self.list_item = list_item
+
+class DependencyMarker:
+    """A "Depends on" / "Dependencies" / "Blocked by" / ... mention.
+
+    text is the rest of the line after the keyword, line_text the whole
+    (stripped) line.
+    """
+
+    __slots__ = ("line", "keyword", "text", "line_text")
+
+    def __init__(self, line: int, keyword: str, text: str, line_text: str):
+        self.line = line
+        self.keyword = keyword
+        self.text = text
+        self.line_text = line_text
+
+class Step:
+    """A "- [ ] **Step 1.2**: ..." checkbox with the markers of its block.
+
+    estimate is in hours, from "(~2h)" or "Estimate: 1d" in the step line or
+    its block (a day is 8 hours).
+    """
+
+    __slots__ = ("id", "title", "line", "checked", "indent", "dependencies", "estimate")
+
+    def __init__(self, step_id: str, title: str, line: int, checked: bool, indent: int):
+        self.id = step_id
+        self.title = title
+        self.line = line
+        self.checked = checked
+        self.indent = indent
+        self.dependencies: List[DependencyMarker] = []
+        self.estimate: Optional[float] = None
+
+class Phase:
+    """A "## Phase N: ..." section, up to the next heading of level 1 or 2.
+
+    length is the size of the section text without surrounding whitespace;
+    dependencies are the markers outside of steps.
+    """
+
+    __slots__ = ("number", "title", "line", "end_line", "length", "checkboxes", "steps", "dependencies")
+
+    def __init__(self, number: int, title: str, line: int):
+        self.number = number
+        self.title = title
+        self.line = line
+        self.end_line = line
+        self.length = 0
+        self.checkboxes: List[Checkbox] = []
+        self.steps: List[Step] = []
+        self.dependencies: List[DependencyMarker] = []
+
+class Plan:
+    """Parsed plan: everything the checks look at, with line numbers."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.title: Optional[str] = None
+        self.headings: List[Heading] = []
+        self.phases: List[Phase] = []
+        self.checkboxes: List[Checkbox] = []
+        self.steps: List[Step] = []
+        self.dependency_markers: List[DependencyMarker] = []
+        # Lines with "[]" that are not a "- [ ]" checkbox
+        self.malformed_lines: List[int] = []
+        self.line_count = 0
+
+def parse_plan(content: str, path: Optional[Path] = None, first_line: int = 1) -> Plan:
+    """Tokenize a Markdown plan into a Plan in one pass over its lines.
+
+    first_line is the line number of the first line of content (a section
+    parsed on its own by IncrementalPlanParser).
+    """
+    plan = Plan(path)
+    lines = content.split('\n')
+    lowered = content.lower().split('\n')
+    if len(lowered) != len(lines):
+        lowered = [line.lower() for line in lines]
+    plan.line_count = len(lines)
+    phase: Optional[Phase] = None
+    step: Optional[Step] = None
+
+    def close_phase(end_line: int):
+        phase.end_line = end_line
+        phase.length = len('\n'.join(lines[phase.line - first_line:end_line - first_line + 1]).strip())
+
+    # Hot loop: bound methods are looked up once
+    find_checkbox = CHECKBOX_RE.search
+    match_step = STEP_RE.match
+    find_marker = DEPENDENCY_MARKER_RE.search
+    add_checkbox = plan.checkboxes.append
+    add_marker = plan.dependency_markers.append
+
+    for number, (line, lower) in enumerate(zip(lines, lowered), first_line):
+        if not line:
+            continue
+
+        if line[0] == '#':
+            heading_match = HEADING_RE.match(line)
+            if heading_match:
+                level = len(heading_match.group(1))
+                title = heading_match.group(2)
+                plan.headings.append(Heading(level, title, number))
+                step = None
+                if level == 1 and plan.title is None:
+                    plan.title = title
+                if level <= 2:
+                    if phase:
+                        close_phase(number - 1)
+                        phase = None
+                    phase_match = PHASE_HEADING_RE.match(title) if level == 2 else None
+                    if phase_match:
+                        phase = Phase(int(phase_match.group(2)), phase_match.group(3) or "", number)
+                        plan.phases.append(phase)
+                continue
+
+        checkbox_match = find_checkbox(line) if '[' in line else None
+        if checkbox_match:
+            text = line[checkbox_match.end():]
+            indent = checkbox_match.start()
+            list_item = not line[:indent].strip()
+            checkbox = Checkbox(number, checkbox_match.group(1) == "x", text.strip(), list_item)
+            add_checkbox(checkbox)
+            if phase:
+                phase.checkboxes.append(checkbox)
+            if list_item:
+                if step and indent <= step.indent:
+                    step = None
+                step_match = match_step(checkbox.text)
+                if step_match:
+                    step = Step(step_match.group(1), step_match.group(2).strip(), number, checkbox.checked, indent)
+                    step.estimate = _estimate(step.title)
+                    plan.steps.append(step)
+                    if phase:
+                        phase.steps.append(step)
+            elif step and line[0] not in " \t":
+                step = None
+        elif step and line[0] not in " \t" and line.strip():
+            # Unindented text ends the step's block
+            step = None
+
+        if '[]' in line and not (checkbox_match and list_item):
+            plan.malformed_lines.append(number)
+
+        if step and step.estimate is None and ('estimat' in lower or 'effort' in lower):
+            step.estimate = _estimate(line)
+
+        if 'depend' in lower or 'dépend' in lower or 'requires' in lower or 'blocked' in lower:
+            marker_match = find_marker(line)
+            if marker_match:
+                marker = DependencyMarker(number, marker_match.group(0), line[marker_match.end():].strip(),
+                                          line.strip())
+                add_marker(marker)
+                if step:
+                    step.dependencies.append(marker)
+                elif phase:
+                    phase.dependencies.append(marker)
+
+    if phase:
+        close_phase(first_line + plan.line_count - 1)
+    return plan
+
+def _estimate(text: str) -> Optional[float]:
+    match = ESTIMATE_RE.search(text) if '~' in text or 'st' in text or 'ffort' in text else None
+    if not match:
+        return None
+    value, unit = float(match.group(1)), match.group(2).lower()
+    return value * 8 if unit.startswith('d') else value / 60 if unit.startswith('m') else value
+
+class IncrementalPlanParser:
+    """Re-parses only the sections of a plan that changed since the last call.
+
+    Parsing state (current phase and step) resets at every heading of
+    level 1 or 2, so the plan is split there and each section is parsed on
+    its own. Sections whose text is unchanged reuse their previous model,
+    with line numbers shifted if lines were added or removed above them.
+    """
+
+    def __init__(self):
+        # Section text -> (first line it was parsed at, model)
+        self.sections: Dict[str, Tuple[int, Plan]] = {}
+        self.reparsed = 0
+        self.section_count = 0
+
+    def parse(self, content: str, path: Optional[Path] = None) -> Plan:
+        plan = Plan(path)
+        starts = [0] + [match.start() for match in SECTION_START_RE.finditer(content) if match.start() > 0]
+        sections: Dict[str, Tuple[int, Plan]] = {}
+        self.reparsed = 0
+        self.section_count = len(starts)
+        first_line = 1
+        for index, start in enumerate(starts):
+            # Each section excludes the newline before the next heading
+            end = starts[index + 1] - 1 if index + 1 < len(starts) else len(content)
+            text = content[start:end]
+            cached = self.sections.get(text)
+            if cached is None or text in sections:
+                model = parse_plan(text, path, first_line)
+                self.reparsed += 1
+            else:
+                parsed_at, model = cached
+                if parsed_at != first_line:
+                    _shift_lines(model, first_line - parsed_at)
+            sections[text] = (first_line, model)
+
+            if plan.title is None:
+                plan.title = model.title
+            plan.headings += model.headings
+            plan.phases += model.phases
+            plan.checkboxes += model.checkboxes
+            plan.steps += model.steps
+            plan.dependency_markers += model.dependency_markers
+            plan.malformed_lines += model.malformed_lines
+            first_line += model.line_count
+        plan.line_count = first_line - 1
+        self.sections = sections
+        return plan
+
+def _shift_lines(plan: Plan, delta: int):
+    for items in (plan.headings, plan.checkboxes, plan.steps, plan.dependency_markers):
+        for item in items:
+            item.line += delta
+    for phase in plan.phases:
+        phase.line += delta
+        phase.end_line += delta
+    plan.malformed_lines = [line + delta for line in plan.malformed_lines]
+
+class GraphNode:
+    """A schedulable unit: a numbered step, or a phase without numbered steps."""
+
+    __slots__ = ("id", "title", "phase", "line", "done", "estimate", "depends")
+
+    def __init__(self, node_id: str, title: str, phase: Optional[int], line: int, done: bool,
+                 estimate: Optional[float]):
+        self.id = node_id
+        self.title = title
+        self.phase = phase
+        self.line = line
+        self.done = done
+        self.estimate = estimate
+        self.depends: List[str] = []
+
+class PlanGraph:
+    """Dependency graph of a plan, from its dependency declarations.
+
+    "None" / "no dependencies" makes a node independent, "Phase N" means
+    every node of phase N, "all previous phases" every node of the phases
+    before it, and "Step N" or dotted ids such as "1.2" are step ids. A
+    phase-level declaration applies to every node of the phase. A step
+    without its own declaration depends on the step before it in its phase
+    (or, for the first step, on the phase's declaration or else the last
+    node of the previous phase), so unannotated plans stay sequential. A
+    declaration none of whose references exist counts as no declaration.
+    """
+
+    def __init__(self, plan: Plan):
+        self.nodes: Dict[str, GraphNode] = {}
+        # (node id, reference, line) of references to steps or phases that do not exist
+        self.dangling: List[Tuple[str, str, int]] = []
+        # (step id, line, line of the first step with that id)
+        self.duplicates: List[Tuple[str, int, int]] = []
+        self._build(plan)
+
+    def _build(self, plan: Plan):
+        # Phase number -> its node ids, in document order
+        phase_nodes: Dict[Optional[int], List[str]] = {}
+        # (node, own and phase declarations (references, line), implicit dependency, first of its phase)
+        pending: List[Tuple[GraphNode, list, list, Optional[str], bool]] = []
+        previous: Optional[str] = None
+
+        in_phase = set()
+        groups: List[Tuple[Optional[Phase], List[Step]]] = []
+        for phase in plan.phases:
+            groups.append((phase, phase.steps))
+            in_phase.update(id(step) for step in phase.steps)
+        loose = [step for step in plan.steps if id(step) not in in_phase]
+        if loose:
+            groups.insert(0, (None, loose))
+
+        # A repeated step id keeps its first occurrence in the document
+        first_steps: Dict[str, Step] = {}
+        for step in plan.steps:
+            if step.id in first_steps:
+                self.duplicates.append((step.id, step.line, first_steps[step.id].line))
+            else:
+                first_steps[step.id] = step
+
+        for phase, steps in groups:
+            number = phase.number if phase else None
+            phase_declarations = _declarations(phase.dependencies) if phase else []
+            ids = phase_nodes.setdefault(number, [])
+            if phase and not steps:
+                node = GraphNode(f"Phase {phase.number}", phase.title, number, phase.line,
+                                 bool(phase.checkboxes) and all(c.checked for c in phase.checkboxes), None)
+                self.nodes[node.id] = node
+                ids.append(node.id)
+                pending.append((node, [], phase_declarations, previous, True))
+                previous = node.id
+                continue
+            first = True
+            for step in steps:
+                if first_steps[step.id] is not step:
+                    continue
+                node = GraphNode(step.id, step.title, number, step.line, step.checked, step.estimate)
+                own = _declarations(step.dependencies, step.line)
+                self.nodes[node.id] = node
+                ids.append(node.id)
+                pending.append((node, own, phase_declarations, previous, first))
+                previous = node.id
+                first = False
+
+        phase_order = [number for number in phase_nodes if number is not None]
+        for node, own, phase_declarations, previous, first in pending:
+            own_depends, own_declared = self._resolve(node, own, phase_order, phase_nodes)
+            phase_depends, phase_declared = self._resolve(node, phase_declarations, phase_order, phase_nodes)
+            # First node of a declared phase follows the phase declaration only
+            implicit = None if own_declared or (first and phase_declared) else previous
+            depends = ([implicit] if implicit else []) + own_depends + phase_depends
+            node.depends = [dep for dep in dict.fromkeys(depends) if dep != node.id]
+
+    def _resolve(self, node: GraphNode, declarations: List[Tuple[List[Tuple[str, str]], int]],
+                 phase_order: List[int], phase_nodes: Dict[Optional[int], List[str]]) -> Tuple[List[str], bool]:
+        """Node ids the declarations refer to, and whether they declare anything:
+        an explicit "None", "all previous phases" or a reference that exists."""
+        depends: List[str] = []
+        declared = False
+        for references, line in declarations:
+            if not references:
+                declared = True
+            for kind, value in references:
+                if kind == "previous":
+                    earlier = phase_order[:phase_order.index(node.phase)] if node.phase in phase_order else []
+                    targets = [dep for number in earlier for dep in phase_nodes[number]]
+                    declared = True
+                elif kind == "phase":
+                    targets = phase_nodes.get(int(value), [])
+                else:
+                    targets = [value] if value in self.nodes else []
+                if targets:
+                    declared = True
+                elif kind != "previous":
+                    self.dangling.append((node.id, f"Phase {value}" if kind == "phase" else f"Step {value}", line))
+                depends.extend(targets)
+        return depends, declared
+
+    def cycles(self) -> List[List[str]]:
+        """Strongly connected groups of nodes that depend on each other (Tarjan, iterative)."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack = set()
+        cycles: List[List[str]] = []
+        counter = 0
+        for root in self.nodes:
+            if root in index:
+                continue
+            work = [(root, iter(self.nodes[root].depends))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, deps = work[-1]
+                advanced = False
+                for dep in deps:
+                    if dep not in index:
+                        index[dep] = low[dep] = counter
+                        counter += 1
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.nodes[dep].depends)))
+                        advanced = True
+                        break
+                    if dep in on_stack:
+                        low[node] = min(low[node], index[dep])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        cycles.append(sorted(component, key=lambda n: self.nodes[n].line))
+        return sorted(cycles, key=lambda c: self.nodes[c[0]].line)
+
+    def schedule(self, remaining: bool = False) -> Dict[str, Any]:
+        """Maximal-parallelism schedule: levels of nodes that can run at once,
+        earliest start/finish per node and the critical path.
+
+        Weights are step estimates (hours) when the plan has any, a missing
+        estimate counting as the mean of the known ones; otherwise every
+        node weighs 1. With remaining, done nodes are left out (their
+        dependents are free to start). Nodes in or behind a cycle are
+        reported as unschedulable.
+        """
+        nodes = {node_id: node for node_id, node in self.nodes.items() if not (remaining and node.done)}
+        estimates = [node.estimate for node in nodes.values() if node.estimate]
+        weighted = bool(estimates)
+        default = sum(estimates) / len(estimates) if weighted else 1.0
+
+        # Kahn's algorithm in document order; what is left is in or behind a cycle
+        waiting = {node_id: sum(1 for dep in node.depends if dep in nodes) for node_id, node in nodes.items()}
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+        for node_id, node in nodes.items():
+            for dep in node.depends:
+                if dep in nodes:
+                    dependents[dep].append(node_id)
+        ready = deque(node_id for node_id, count in waiting.items() if count == 0)
+        level: Dict[str, int] = {}
+        start: Dict[str, float] = {}
+        finish: Dict[str, float] = {}
+        order: List[str] = []
+        while ready:
+            node_id = ready.popleft()
+            node = nodes[node_id]
+            deps = [dep for dep in node.depends if dep in nodes]
+            level[node_id] = 1 + max((level[dep] for dep in deps), default=-1)
+            start[node_id] = max((finish[dep] for dep in deps), default=0.0)
+            finish[node_id] = start[node_id] + (node.estimate or default if weighted else 1.0)
+            order.append(node_id)
+            for dependent in dependents[node_id]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+
+        levels: List[List[str]] = [[] for _ in range(1 + max(level.values(), default=-1))]
+        for node_id in order:
+            levels[level[node_id]].append(node_id)
+
+        critical: List[str] = []
+        if finish:
+            current: Optional[str] = max(order, key=lambda node_id: finish[node_id])
+            while current:
+                critical.append(current)
+                deps = [dep for dep in nodes[current].depends if dep in finish]
+                current = max(deps, key=lambda dep: finish[dep]) if deps else None
+            critical.reverse()
+
+        return {
+            "weighted": weighted,
+            "unit": "hours" if weighted else "steps",
+            "levels": levels,
+            "schedule": [
+                {
+                    "id": node_id,
+                    "title": nodes[node_id].title,
+                    "phase": nodes[node_id].phase,
+                    "line": nodes[node_id].line,
+                    "depends": [dep for dep in nodes[node_id].depends if dep in nodes],
+                    "level": level[node_id],
+                    "start": round(start[node_id], 3),
+                    "finish": round(finish[node_id], 3)
+                }
+                for node_id in sorted(order, key=lambda node_id: (start[node_id], nodes[node_id].line))
+            ],
+            "critical_path": {
+                "nodes": critical,
+                "length": round(finish[critical[-1]], 3) if critical else 0
+            },
+            "max_parallelism": max((len(nodes_at_level) for nodes_at_level in levels), default=0),
+            "cycles": self.cycles(),
+            "dangling": [{"id": node_id, "reference": reference, "line": line}
+                         for node_id, reference, line in self.dangling],
+            "unschedulable": [node_id for node_id in nodes if node_id not in level]
+        }
+
+def _declaration(marker: DependencyMarker, step_line: Optional[int] = None) -> Optional[List[Tuple[str, str]]]:
+    """References of a dependency declaration, None if the marker is not one.
+
+    An empty list is an explicit "None"; free text that names no step or
+    phase is not a declaration. Inline declarations are only read on the
+    step's own line.
+    """
+    match = DECLARATION_RE.match(marker.line_text)
+    if match:
+        text = match.group(1)
+    elif step_line is not None and marker.line == step_line:
+        inline = INLINE_DECLARATION_RE.search(marker.line_text)
+        if not inline:
+            return None
+        text = inline.group(1)
+    else:
+        return None
+
+    lowered = text.lower().strip(" *:-")
+    if lowered.startswith(("none", "no dependencies", "no dependency", "aucune")):
+        return []
+    references: List[Tuple[str, str]] = []
+    if "previous phases" in lowered or "prior phases" in lowered:
+        references.append(("previous", ""))
+    references.extend(("phase", number) for number in PHASE_REFERENCE_RE.findall(text))
+    rest = PHASE_REFERENCE_RE.sub("", text)
+    step_ids = [step_id for steps in STEP_LIST_RE.findall(rest) for step_id in STEP_REFERENCE_RE.findall(steps)]
+    step_ids.extend(DOTTED_STEP_RE.findall(STEP_LIST_RE.sub("", rest)))
+    references.extend(("step", step_id) for step_id in dict.fromkeys(step_ids))
+    return references or None
+
+def _declarations(markers: List[DependencyMarker], step_line: Optional[int] = None) -> List[Tuple[List[Tuple[str, str]], int]]:
+    """(references, line) of the markers that are dependency declarations."""
+    declarations = []
+    for marker in markers:
+        references = _declaration(marker, step_line)
+        if references is not None:
+            declarations.append((references, marker.line))
+    return declarations
+
+class PlanVisitor:
+    """Walks a Plan: visit_plan, then all headings, phases, checkboxes, steps
+    and dependency markers (each kind in document order), then leave_plan."""
+
+    def visit_plan(self, plan: Plan):
+        pass
+
+    def visit_heading(self, heading: Heading):
+        pass
+
+    def visit_phase(self, phase: Phase):
+        pass
+
+    def visit_checkbox(self, checkbox: Checkbox):
+        pass
+
+    def visit_step(self, step: Step):
+        pass
+
+    def visit_marker(self, marker: DependencyMarker):
+        pass
+
+    def leave_plan(self, plan: Plan):
+        pass
+
+def walk(plan: Plan, visitors: List[PlanVisitor]):
+    for visitor in visitors:
+        visitor.visit_plan(plan)
+    for items, hook in ((plan.headings, "visit_heading"), (plan.phases, "visit_phase"),
+                        (plan.checkboxes, "visit_checkbox"), (plan.steps, "visit_step"),
+                        (plan.dependency_markers, "visit_marker")):
+        # Only visitors that override the hook see the items
+        handlers = [getattr(visitor, hook) for visitor in visitors
+                    if getattr(type(visitor), hook) is not getattr(PlanVisitor, hook)]
+        if handlers:
+            for item in items:
+                for handler in handlers:
+                    handler(item)
+    for visitor in visitors:
+        visitor.leave_plan(plan)
+
+class PlanCheck(PlanVisitor):
+    """A validation rule; diagnostics are (severity, message, line) tuples."""
+
+    def __init__(self):
+        self.diagnostics: List[Tuple[str, str, Optional[int]]] = []
+
+    def error(self, message: str, line: Optional[int] = None):
+        self.diagnostics.append(("error", message, line))
+
+    def warning(self, message: str, line: Optional[int] = None):
+        self.diagnostics.append(("warning", message, line))
+
+class TitleCheck(PlanCheck):
+    """Plan has a title."""
+
+    def leave_plan(self, plan: Plan):
+        if plan.title is None:
+            self.error("Missing plan title (should start with # Title)")
+
+class SectionCheck(PlanCheck):
+    """Plan has a section (heading of level 2 or more) matching a pattern."""
+
+    pattern = OVERVIEW_RE
+    message = "Consider adding an Overview/Description section"
+
+    def visit_plan(self, plan: Plan):
+        self.found = False
+
+    def visit_heading(self, heading: Heading):
+        if heading.level >= 2 and self.pattern.match(heading.title):
+            self.found = True
+
+    def leave_plan(self, plan: Plan):
+        if not self.found:
+            self.warning(self.message)
+
+class OverviewCheck(SectionCheck):
+    """Plan has an overview or description section."""
+
+class ProgressTrackerCheck(SectionCheck):
+    """Plan has a progress tracking section."""
+
+    pattern = PROGRESS_RE
+    message = "Consider adding a Progress Tracker section"
+
+class PhasesCheck(PlanCheck):
+    """Plan has phase sections."""
+
+    def leave_plan(self, plan: Plan):
+        if not plan.phases:
+            self.error("No phases found. Plan should have phases/steps (e.g., '## Phase 1: ...')")
+        elif len(plan.phases) == 1:
+            self.warning("Only one phase found. Consider breaking down into multiple phases.", plan.phases[0].line)
+
+class CheckboxFormatCheck(PlanCheck):
+    """Checkboxes are properly formatted."""
+
+    def visit_plan(self, plan: Plan):
+        self.problems: List[Tuple[int, str]] = [
+            (line, "Malformed checkbox. Use '- [ ]' or '- [x]' format") for line in plan.malformed_lines
+        ]
+
+    def visit_checkbox(self, checkbox: Checkbox):
+        if checkbox.list_item and not checkbox.text:
+            self.problems.append((checkbox.line, "Checkbox without description"))
+
+    def leave_plan(self, plan: Plan):
+        for line, message in sorted(self.problems, key=lambda problem: problem[0]):
+            self.error(f"Line {line}: {message}", line)
+        if not plan.checkboxes:
+            self.error("No checkboxes found. Implementation plan should use checkboxes for tracking.")
+
+class ValidationCriteriaCheck(PlanCheck):
+    """Phases have validation criteria."""
+
+    def visit_plan(self, plan: Plan):
+        self.found = False
+
+    def visit_heading(self, heading: Heading):
+        if heading.level >= 2 and CRITERIA_RE.match(heading.title):
+            self.found = True
+        elif heading.level >= 3 and FRENCH_CRITERIA_RE.match(heading.title):
+            self.found = True
+
+    def leave_plan(self, plan: Plan):
+        if any(phase.title for phase in plan.phases) and not self.found:
+            self.warning("No validation criteria found. Consider adding success criteria for phases.")
+
+class DependenciesMarkedCheck(PlanCheck):
+    """Dependencies are marked where appropriate (plans with several phases)."""
+
+    def leave_plan(self, plan: Plan):
+        if len(plan.phases) < 2 or plan.dependency_markers:
+            return
+        if not any(DEPENDENCY_MARKER_RE.search(heading.title) for heading in plan.headings):
+            self.warning("No dependencies marked. Consider documenting dependencies between phases/steps.")
+
+class PhaseStructureCheck(PlanCheck):
+    """Phases have tasks and a description."""
+
+    def visit_plan(self, plan: Plan):
+        self.index = 0
+
+    def visit_phase(self, phase: Phase):
+        self.index += 1
+        if not phase.checkboxes:
+            self.warning(f"Phase {self.index}: No checkboxes found. Add task checkboxes to track progress.",
+                         phase.line)
+        if phase.length < 100:  # Arbitrary minimum length
+            self.warning(f"Phase {self.index}: Phase description seems very short. Consider adding more detail.",
+                         phase.line)
+
+class DependencyGraphCheck(PlanCheck):
+    """Dependency declarations form a graph without cycles or unknown references."""
+
+    def leave_plan(self, plan: Plan):
+        graph = PlanGraph(plan)
+        for step_id, line, first_line in graph.duplicates:
+            self.warning(f"Line {line}: Duplicate Step {step_id} (first defined on line {first_line})", line)
+        for cycle in graph.cycles():
+            names = " → ".join(_node_name(node_id) for node_id in cycle + cycle[:1])
+            self.error(f"Line {graph.nodes[cycle[0]].line}: Dependency cycle: {names}", graph.nodes[cycle[0]].line)
+        for node_id, reference, line in graph.dangling:
+            self.warning(f"Line {line}: {_node_name(node_id)} depends on unknown {reference}", line)
+
+def _node_name(node_id: str) -> str:
+    return node_id if node_id.startswith("Phase") else f"Step {node_id}"
+
+# Checks in reporting order
+CHECKS = [
+    TitleCheck,
+    OverviewCheck,
+    ProgressTrackerCheck,
+    PhasesCheck,
+    CheckboxFormatCheck,
+    ValidationCriteriaCheck,
+    DependenciesMarkedCheck,
+    PhaseStructureCheck,
+    DependencyGraphCheck
+]
 
 class PlanValidator:
-    def __init__(self, plan_path: str):
+    def __init__(self, plan_path: str, parse: Callable[[str, Path], Plan] = parse_plan):
         self.plan_path = Path(plan_path)
+        self.parse = parse
         self.errors: List[str] = []
         self.warnings: List[str] = []
+        self.diagnostics: List[Dict[str, Any]] = []
         self.content = ""
+        self.plan: Optional[Plan] = None
 
     def validate(self) -> bool:
         """Validate the plan file. Returns True if valid, False otherwise."""
         if not self.plan_path.exists():
             self.errors.append(f"Plan file not found: {self.plan_path}")
+            self.diagnostics.append(_diagnostic("PlanFile", "error", self.errors[-1], None))
             return False
 
         self.content = self.plan_path.read_text(encoding='utf-8')
+        self.plan = self.parse(self.content, self.plan_path)
 
         # Run all validation checks
-        self._check_has_title()
-        self._check_has_overview()
-        self._check_has_progress_tracker()
-        self._check_has_phases()
-        self._check_checkboxes_format()
-        self._check_validation_criteria()
-        self._check_dependencies_marked()
-        self._check_phase_structure()
+        checks = [check() for check in CHECKS]
+        walk(self.plan, checks)
+        for check in checks:
+            for severity, message, line in check.diagnostics:
+                (self.errors if severity == "error" else self.warnings).append(message)
+                self.diagnostics.append(_diagnostic(type(check).__name__, severity, message, line))
 
         return len(self.errors) == 0
 
-    def _check_has_title(self):
-        """Check if plan has a title."""
-        if not re.search(r'^#\s+.+', self.content, re.MULTILINE):
-            self.errors.append("Missing plan title (should start with # Title)")
-
-    def _check_has_overview(self):
-        """Check if plan has an overview or description section."""
-        overview_patterns = [
-            r'##\s+Overview',
-            r'##\s+Description',
-            r'##\s+Vue d\'ensemble'  # French variant
-        ]
-        if not any(re.search(pattern, self.content, re.IGNORECASE) for pattern in overview_patterns):
-            self.warnings.append("Consider adding an Overview/Description section")
-
-    def _check_has_progress_tracker(self):
-        """Check if plan has a progress tracking section."""
-        progress_patterns = [
-            r'##\s+Progress',
-            r'##\s+État d\'Avancement',  # French variant
-            r'##\s+Status'
-        ]
-        if not any(re.search(pattern, self.content, re.IGNORECASE) for pattern in progress_patterns):
-            self.warnings.append("Consider adding a Progress Tracker section")
-
-    def _check_has_phases(self):
-        """Check if plan has phase sections."""
-        phases = re.findall(r'^##\s+(Phase|Step|Étape)\s+\d+', self.content, re.MULTILINE | re.IGNORECASE)
-        if not phases:
-            self.errors.append("No phases found. Plan should have phases/steps (e.g., '## Phase 1: ...')")
-        elif len(phases) == 1:
-            self.warnings.append("Only one phase found. Consider breaking down into multiple phases.")
-
-    def _check_checkboxes_format(self):
-        """Check if checkboxes are properly formatted."""
-        lines = self.content.split('\n')
-
-        for i, line in enumerate(lines, 1):
-            # Check for malformed checkboxes
-            if '[]' in line and not re.match(r'^\s*-\s+\[[x ]\]', line):
-                self.errors.append(f"Line {i}: Malformed checkbox. Use '- [ ]' or '- [x]' format")
-
-            # Check for checkboxes without task description
-            if re.match(r'^\s*-\s+\[[x ]\]\s*$', line):
-                self.errors.append(f"Line {i}: Checkbox without description")
-
-        # Check if plan has any checkboxes
-        if not re.search(r'-\s+\[[x ]\]', self.content):
-            self.errors.append("No checkboxes found. Implementation plan should use checkboxes for tracking.")
-
-    def _check_validation_criteria(self):
-        """Check if phases have validation criteria."""
-        phases = re.findall(r'^##\s+(Phase|Step|Étape)\s+\d+:?\s+.+$', self.content, re.MULTILINE | re.IGNORECASE)
-
-        if phases:
-            # Look for validation/success criteria sections
-            criteria_patterns = [
-                r'###\s+(Validation|Success|Acceptance)\s+Criteria',
-                r'###\s+Critères\s+de\s+(Validation|Succès)',  # French
-                r'##\s+(Validation|Success|Acceptance)\s+Criteria'
-            ]
-
-            criteria_found = any(re.search(pattern, self.content, re.IGNORECASE) for pattern in criteria_patterns)
-
-            if not criteria_found:
-                self.warnings.append("No validation criteria found. Consider adding success criteria for phases.")
-
-    def _check_dependencies_marked(self):
-        """Check if dependencies are marked where appropriate."""
-        # Look for dependency markers
-        dependency_patterns = [
-            r'Depends\s+on',
-            r'Dependencies',
-            r'Dépendances',  # French
-            r'Requires',
-            r'Blocked\s+by'
-        ]
+    def result(self) -> Dict[str, Any]:
+        """Validation result as a JSON-serializable dict."""
+        return {
+            "path": str(self.plan_path),
+            "valid": not self.errors,
+            "errors": [d for d in self.diagnostics if d["severity"] == "error"],
+            "warnings": [d for d in self.diagnostics if d["severity"] == "warning"]
+        }
+
+    def print_results(self):
+        """Print validation results."""
+        print_result(self.result())
 
-        phases = re.findall(r'^##\s+(Phase|Step|Étape)\s+\d+', self.content, re.MULTILINE | re.IGNORECASE)
+def _diagnostic(rule: str, severity: str, message: str, line: Optional[int]) -> Dict[str, Any]:
+    return {"rule": rule, "severity": severity, "message": message, "line": line}
 
-        if len(phases) > 1:  # Only check if there are multiple phases
-            dependency_found = any(re.search(pattern, self.content, re.IGNORECASE) for pattern in dependency_patterns)
+def print_result(result: Dict[str, Any]):
+    """Print one validation result for humans."""
+    errors = [error["message"] for error in result["errors"]]
+    warnings = [warning["message"] for warning in result["warnings"]]
+    print(f"\n{'='*70}")
+    print(f"Plan Validation Results: {Path(result['path']).name}")
+    print(f"{'='*70}\n")
 
-            if not dependency_found:
-                self.warnings.append("No dependencies marked. Consider documenting dependencies between phases/steps.")
+    if not errors and not warnings:
+        print("✅ Plan is valid! No errors or warnings found.\n")
+        return
 
-    def _check_phase_structure(self):
-        """Check if phases have proper structure."""
-        # Split content into phases
-        phase_pattern = r'^##\s+(Phase|Step|Étape)\s+\d+.*?(?=^##\s+(?:Phase|Step|Étape)\s+\d+|$)'
-        phases = re.findall(phase_pattern, self.content, re.MULTILINE | re.DOTALL | re.IGNORECASE)
+    if errors:
+        print(f"❌ ERRORS ({len(errors)}):\n")
+        for error in errors:
+            print(f"  • {error}")
+        print()
 
-        if phases:
-            for i, phase in enumerate(phases, 1):
-                # Check if phase has any checkboxes
-                if not re.search(r'-\s+\[[x ]\]', phase):
-                    self.warnings.append(f"Phase {i}: No checkboxes found. Add task checkboxes to track progress.")
+    if warnings:
+        print(f"⚠️  WARNINGS ({len(warnings)}):\n")
+        for warning in warnings:
+            print(f"  • {warning}")
+        print()
 
-                # Check if phase has description/goals
-                if len(phase.strip()) < 100:  # Arbitrary minimum length
-                    self.warnings.append(f"Phase {i}: Phase description seems very short. Consider adding more detail.")
+    if not errors:
+        print("✅ No errors found. Plan structure is valid.\n")
+    else:
+        print("❌ Please fix errors before proceeding.\n")
 
-    def print_results(self):
-        """Print validation results."""
-        print(f"\n{'='*70}")
-        print(f"Plan Validation Results: {self.plan_path.name}")
-        print(f"{'='*70}\n")
+    print(f"{'='*70}\n")
+
+def validate_file(path: str) -> Dict[str, Any]:
+    """Validate one plan file (process pool entry point)."""
+    validator = PlanValidator(path)
+    validator.validate()
+    return validator.result()
+
+class ValidationCache:
+    """Results of unchanged files, kept in a JSON file.
+
+    A file is unchanged if its mtime and size match, or failing that its
+    content hash. Entries are tied to this script's own hash, so changing
+    the checks invalidates them.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.validator = _hash_file(Path(__file__))
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and data.get("validator") == self.validator:
+            self.entries = data.get("entries", {})
+
+    def lookup(self, path: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(os.path.abspath(path))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if entry is None:
+            return None
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return dict(entry["result"], path=path)
+        if entry["size"] == stat.st_size and entry["sha256"] == _hash_file(Path(path)):
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self.dirty = True
+            return dict(entry["result"], path=path)
+        return None
 
-        if not self.errors and not self.warnings:
-            print("✅ Plan is valid! No errors or warnings found.\n")
+    def store(self, path: str, result: Dict[str, Any]):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Missing files are not cached
             return
+        self.entries[os.path.abspath(path)] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": _hash_file(Path(path)),
+            "result": result
+        }
+        self.dirty = True
 
-        if self.errors:
-            print(f"❌ ERRORS ({len(self.errors)}):\n")
-            for error in self.errors:
-                print(f"  • {error}")
-            print()
+    def save(self):
+        if not self.dirty:
+            return
+        data = {"version": CACHE_VERSION, "validator": self.validator, "entries": self.entries}
+        temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(data), encoding='utf-8')
+        os.replace(temp_path, self.path)
 
-        if self.warnings:
-            print(f"⚠️  WARNINGS ({len(self.warnings)}):\n")
-            for warning in self.warnings:
-                print(f"  • {warning}")
-            print()
+def _hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
 
-        if not self.errors:
-            print("✅ No errors found. Plan structure is valid.\n")
+def expand_paths(patterns: List[str], name: str = "Plan.md") -> List[str]:
+    """Plan files for the given files, directories (searched recursively for
+    files matching name) and globs, in argument order without duplicates."""
+    paths: List[str] = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = []
+            for root, dirs, files in os.walk(pattern):
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+                found.extend(os.path.join(root, f) for f in sorted(files) if fnmatch.fnmatch(f, name))
+        elif glob.has_magic(pattern):
+            found = sorted(glob.glob(pattern, recursive=True))
         else:
-            print("❌ Please fix errors before proceeding.\n")
+            # Missing files are reported by the validator
+            found = [pattern]
+        for path in found:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+def validate_files(paths: List[str], jobs: int = 1,
+                   cache: Optional[ValidationCache] = None) -> Iterator[Dict[str, Any]]:
+    """Validate plan files, yielding results in input order as they are ready."""
+    cached = [cache.lookup(path) if cache else None for path in paths]
+    pending = [path for path, result in zip(paths, cached) if result is None]
+
+    executor = None
+    if jobs > 1 and len(pending) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(pending)))
+        fresh = executor.map(validate_file, pending, chunksize=max(1, len(pending) // (jobs * 4)))
+    else:
+        fresh = map(validate_file, pending)
+
+    try:
+        for path, result in zip(paths, cached):
+            if result is None:
+                result = next(fresh)
+                if cache:
+                    cache.store(path, result)
+                yield dict(result, cached=False)
+            else:
+                yield dict(result, cached=True)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+def sarif_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """SARIF 2.1.0 log of validation results."""
+    rules = [{"id": "PlanFile", "shortDescription": {"text": "Plan file exists."}}]
+    rules += [
+        {"id": check.__name__, "shortDescription": {"text": (check.__doc__ or check.__name__).strip()}}
+        for check in CHECKS
+    ]
+    findings = []
+    for result in results:
+        for diagnostic in result["errors"] + result["warnings"]:
+            location: Dict[str, Any] = {"artifactLocation": {"uri": Path(result["path"]).as_posix()}}
+            if diagnostic["line"]:
+                location["region"] = {"startLine": diagnostic["line"]}
+            findings.append({
+                "ruleId": diagnostic["rule"],
+                "level": diagnostic["severity"],
+                "message": {"text": diagnostic["message"]},
+                "locations": [{"physicalLocation": location}]
+            })
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [{"tool": {"driver": {"name": "validate_plan", "rules": rules}}, "results": findings}]
+    }
+
+class _Inotify:
+    """Linux inotify on a directory, through libc (no third-party watcher)."""
+
+    EVENTS = 0x2 | 0x8 | 0x80 | 0x100  # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), self.EVENTS) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        """Names of the files changed within timeout seconds (None: wait forever)."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        names, offset = [], 0
+        while offset < len(data):
+            _, _, _, length = self.HEADER.unpack_from(data, offset)
+            offset += self.HEADER.size
+            names.append(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
 
-        print(f"{'='*70}\n")
+def watch(path: str, output_format: str = "text", debounce: float = 0.05, poll_interval: float = 0.1):
+    """Validate a plan every time it changes, until interrupted.
+
+    Uses inotify where available (editors that replace the file on save are
+    handled by watching its directory), otherwise polls mtime and size.
+    Bursts of changes closer than debounce seconds are validated once.
+    """
+    parser = IncrementalPlanParser()
+    target = os.path.basename(path)
+    try:
+        watcher: Optional[_Inotify] = _Inotify(os.path.dirname(os.path.abspath(path)))
+    except (OSError, AttributeError):
+        watcher = None
+        print(f"inotify unavailable, polling every {poll_interval}s", file=sys.stderr)
+
+    def stamp() -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changed(timeout: Optional[float], last: Optional[Tuple[int, int]]) -> bool:
+        if watcher:
+            return target in watcher.wait(timeout)
+        time.sleep(timeout if timeout is not None else poll_interval)
+        return stamp() != last
+
+    last_content = None
+    last = stamp()
+    while True:
+        started = time.perf_counter()
+        validator = PlanValidator(path, parser.parse)
+        validator.validate()
+        if validator.content != last_content or validator.plan is None:
+            last_content = validator.content
+            result = dict(validator.result(), elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+                          sections=parser.section_count, reparsed_sections=parser.reparsed)
+            if output_format == "jsonl":
+                print(json.dumps(result), flush=True)
+            else:
+                print_result(result)
+                print(f"⏱  Validated in {result['elapsed_ms']:.1f} ms "
+                      f"({result['reparsed_sections']} of {result['sections']} section(s) parsed), watching...",
+                      flush=True)
+
+        while not changed(None, last):
+            pass
+        # Debounce: wait until the file has been quiet for a while
+        last = stamp()
+        while changed(debounce, last):
+            last = stamp()
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python validate_plan.py <plan-file.md>")
-        print("\nExample:")
-        print("  python validate_plan.py Plan.md")
-        print("  python validate_plan.py implementation-plan.md")
+    parser = argparse.ArgumentParser(description="Validate implementation plans")
+    parser.add_argument("paths", nargs="+", help="Plan files, directories or globs")
+    parser.add_argument("--format", choices=["text", "jsonl", "sarif"], default="text",
+                        help="Output format (default: text)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Validate files in N worker processes (default: CPU count)")
+    parser.add_argument("--cache", help="Cache file; unchanged plans are not validated again")
+    parser.add_argument("--name", default="Plan.md",
+                        help="File name pattern searched for in directories (default: Plan.md)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Validate one plan again every time it changes (text or jsonl output)")
+    parser.add_argument("--debounce", type=float, default=50,
+                        help="--watch: milliseconds of quiet before validating (default: 50)")
+    parser.add_argument("--schedule", action="store_true",
+                        help="Print the dependency schedule and critical path of one plan as JSON")
+    parser.add_argument("--remaining", action="store_true",
+                        help="--schedule: leave out steps that are already checked")
+
+    args = parser.parse_args()
+
+    if args.schedule:
+        if len(args.paths) != 1 or not os.path.isfile(args.paths[0]):
+            print("Error: --schedule takes one plan file", file=sys.stderr)
+            sys.exit(1)
+        with open(args.paths[0], 'r', encoding='utf-8') as f:
+            plan = parse_plan(f.read(), args.paths[0])
+        graph = PlanGraph(plan)
+        output = {"plan": args.paths[0], **graph.schedule(args.remaining)}
+        print(json.dumps(output, indent=2, ensure_ascii=False))
+        sys.exit(1 if output["cycles"] else 0)
+
+    if args.watch:
+        if len(args.paths) != 1 or os.path.isdir(args.paths[0]) or args.format == "sarif":
+            print("Error: --watch takes one plan file and text or jsonl output", file=sys.stderr)
+            sys.exit(1)
+        try:
+            watch(args.paths[0], args.format, args.debounce / 1000)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    paths = expand_paths(args.paths, args.name)
+    if not paths:
+        print("Error: No plan files found", file=sys.stderr)
         sys.exit(1)
 
-    plan_path = sys.argv[1]
-    validator = PlanValidator(plan_path)
+    cache = ValidationCache(args.cache) if args.cache else None
+    results = []
+    for result in validate_files(paths, args.jobs, cache):
+        results.append(result)
+        if args.format == "text":
+            print_result(result)
+        elif args.format == "jsonl":
+            print(json.dumps(result), flush=True)
+    if cache:
+        cache.save()
 
-    is_valid = validator.validate()
-    validator.print_results()
+    invalid = [result for result in results if not result["valid"]]
+    if args.format == "sarif":
+        print(json.dumps(sarif_report(results), indent=2))
+    elif args.format == "text" and len(results) > 1:
+        print(f"Validated {len(results)} plan(s): {len(results) - len(invalid)} valid, {len(invalid)} with errors")
 
     # Exit with error code if validation failed
-    sys.exit(0 if is_valid else 1)
+    sys.exit(1 if invalid else 0)
 
 if __name__ == "__main__":
     main()
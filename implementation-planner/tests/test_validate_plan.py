@@ -0,0 +1,306 @@
+"""Tests for scripts/validate_plan.py (run with: python -m unittest discover implementation-planner/tests)."""
+
+import random
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import baseline_validate_plan  # noqa: E402
+from validate_plan import IncrementalPlanParser, PlanGraph, PlanValidator, parse_plan  # noqa: E402
+
+REFERENCES = Path(__file__).resolve().parents[1] / "references"
+
+def graph(text: str) -> PlanGraph:
+    return PlanGraph(parse_plan(text, "Plan.md"))
+
+def depends(text: str) -> dict:
+    return {node_id: node.depends for node_id, node in graph(text).nodes.items()}
+
+TWO_PHASES = """# Plan
+
+## Phase 1: Backend
+
+- [ ] **Step 1.1**: API
+- [ ] **Step 1.2**: Worker
+
+## Phase 2: Frontend
+
+- [ ] **Step 2.1**: Pages
+  - **Dependencies**: {declaration}
+- [ ] **Step 2.2**: Forms
+"""
+
+class DeclarationTest(unittest.TestCase):
+    def test_free_text_keeps_the_implicit_predecessor(self):
+        result = graph(TWO_PHASES.format(declaration="Backend API must be deployed first"))
+
+        self.assertEqual(result.nodes["2.1"].depends, ["1.2"])
+        self.assertEqual(result.schedule()["levels"], [["1.1"], ["1.2"], ["2.1"], ["2.2"]])
+        self.assertEqual(result.dangling, [])
+
+    def test_dangling_references_keep_the_implicit_predecessor(self):
+        result = graph(TWO_PHASES.format(declaration="Step 7.1 and Phase 9"))
+
+        self.assertEqual(result.nodes["2.1"].depends, ["1.2"])
+        self.assertEqual([reference for _, reference, _ in result.dangling], ["Phase 9", "Step 7.1"])
+
+    def test_explicit_none_makes_a_step_independent(self):
+        self.assertEqual(depends(TWO_PHASES.format(declaration="None"))["2.1"], [])
+
+    def test_existing_reference_replaces_the_implicit_predecessor(self):
+        self.assertEqual(depends(TWO_PHASES.format(declaration="Step 1.1, Step 7.1"))["2.1"], ["1.1"])
+
+    def test_step_ids_are_step_lists_or_dotted_ids(self):
+        self.assertEqual(depends(TWO_PHASES.format(declaration="Steps 1.1 and 1.2"))["2.1"], ["1.1", "1.2"])
+        self.assertEqual(depends(TWO_PHASES.format(declaration="1.1 (schema)"))["2.1"], ["1.1"])
+
+    def test_requires_lines_and_bare_numbers_are_not_step_references(self):
+        plan = """# Plan
+
+## Phase 1: Setup
+
+- [ ] **Step 1**: Tooling
+- [ ] **Step 2**: Reviews
+- [ ] **Step 3**: Release
+  - **Requires**: Node 18 and 2 reviewers
+- [ ] **Step 4**: Announce
+  - **Dependencies**: 2 approvals from the team
+"""
+        result = graph(plan)
+
+        self.assertEqual(result.nodes["3"].depends, ["2"])
+        self.assertEqual(result.nodes["4"].depends, ["3"])
+        self.assertEqual(result.dangling, [])
+
+# Plans that trigger every check of the baseline validator
+PLANS = {
+    "no title or phases": "Some notes\n\n- [] todo\n",
+    "single phase": """# Plan
+
+## Phase 1: Everything
+
+- [ ] **Step 1.1**: Do it
+- [x]
+- [ ] broken [] box
+""",
+    "french": """# Plan de migration
+
+## Vue d'ensemble
+
+Migration de la base.
+
+## État d'Avancement
+
+## Phase 1: Préparation
+
+- [x] **Step 1.1**: Sauvegarde
+
+### Critères de Validation
+
+- [ ] Sauvegarde vérifiée
+
+## Phase 2: Migration
+
+- [ ] **Step 2.1**: Scripts
+  - **Dépendances**: Step 1.1
+""",
+    "steps as sections": """# Plan
+
+## Overview
+
+## Status
+
+## Step 1: Schema
+- [ ] Tables
+
+## Step 2: API
+No tasks yet.
+""",
+}
+
+# Warnings of the baseline's phase structure check, which only ever saw the heading line of a phase
+BASELINE_PHASE_WARNING_RE = re.compile(r'Phase \d+: (No checkboxes found|Phase description seems very short)')
+
+def generated_plan(phases: int, steps: int) -> str:
+    lines = ["# Generated plan", "", "## Overview", "", "Generated.", "", "## Progress Tracker", ""]
+    for number in range(1, phases + 1):
+        lines += [f"## Phase {number}: Part {number}", "", "### Steps", ""]
+        for index in range(1, steps + 1):
+            lines.append(f"- [ ] **Step {number}.{index}**: Task {index} (~{index}h)")
+            if index == 1 and number > 1:
+                lines.append(f"  - **Dependencies**: Phase {number - 1}")
+        lines += ["", "### Validation Criteria", "", "- [ ] Reviewed", ""]
+    return "\n".join(lines)
+
+class BaselineDiagnosticsTest(unittest.TestCase):
+    """Checks that existed before the rewrite report the same messages in the same order."""
+
+    def assertSameDiagnostics(self, path: Path):
+        baseline = baseline_validate_plan.PlanValidator(str(path))
+        validator = PlanValidator(str(path))
+        self.assertEqual(validator.validate(), baseline.validate())
+        kept = [d["message"] for d in validator.diagnostics
+                if d["severity"] == "warning" and d["rule"] not in ("PhaseStructureCheck", "DependencyGraphCheck")]
+        self.assertEqual(validator.errors, baseline.errors)
+        self.assertEqual(kept, [w for w in baseline.warnings if not BASELINE_PHASE_WARNING_RE.match(w)])
+
+    def test_reference_plans(self):
+        for path in sorted(REFERENCES.glob("*.md")):
+            with self.subTest(path.name):
+                self.assertSameDiagnostics(path)
+
+    def test_plans_for_every_check(self):
+        plans = dict(PLANS, generated=generated_plan(6, 5))
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, text in plans.items():
+                with self.subTest(name):
+                    path = Path(tmp) / "Plan.md"
+                    path.write_text(text, encoding="utf-8")
+                    self.assertSameDiagnostics(path)
+
+    def test_phase_structure_reads_the_whole_phase(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "Plan.md"
+            path.write_text(generated_plan(3, 4), encoding="utf-8")
+            baseline = baseline_validate_plan.PlanValidator(str(path))
+            baseline.validate()
+            validator = PlanValidator(str(path))
+            validator.validate()
+
+        self.assertEqual(len(baseline.warnings), 6)
+        self.assertEqual(validator.warnings, [])
+
+def model(plan) -> dict:
+    """Everything a parsed plan holds, as comparable values."""
+    return {
+        "title": plan.title,
+        "line_count": plan.line_count,
+        "headings": [(h.level, h.title, h.line) for h in plan.headings],
+        "phases": [(p.number, p.title, p.line, p.end_line, p.length, [c.line for c in p.checkboxes],
+                    [s.id for s in p.steps], [m.line for m in p.dependencies]) for p in plan.phases],
+        "checkboxes": [(c.line, c.checked, c.text, c.list_item) for c in plan.checkboxes],
+        "steps": [(s.id, s.title, s.line, s.checked, s.indent, s.estimate, [m.line for m in s.dependencies])
+                  for s in plan.steps],
+        "markers": [(m.line, m.keyword, m.text, m.line_text) for m in plan.dependency_markers],
+        "malformed_lines": plan.malformed_lines,
+    }
+
+class IncrementalParseTest(unittest.TestCase):
+    def test_randomized_edits_match_a_full_parse(self):
+        rng = random.Random(21)
+        lines = generated_plan(8, 4).split("\n")
+        parser = IncrementalPlanParser()
+        for iteration in range(300):
+            edit = rng.randrange(6)
+            index = rng.randrange(len(lines))
+            if edit == 0:
+                lines[index] = lines[index].replace("- [ ]", "- [x]", 1)
+            elif edit == 1:
+                lines.insert(index, f"- [ ] **Step 9.{rng.randrange(9)}**: Added (~{rng.randrange(1, 9)}h)")
+            elif edit == 2 and len(lines) > 20:
+                del lines[index]
+            elif edit == 3:
+                lines.insert(index, f"## Phase {rng.randrange(1, 12)}: Inserted")
+            elif edit == 4:
+                lines.insert(index, rng.choice(["  - **Dependencies**: Step 1.1", "Depends on Phase 2", "- [] oops"]))
+            else:
+                # Repeat a section, so two sections have the same text
+                start = next((i for i in range(index, -1, -1) if lines[i].startswith("#")), 0)
+                lines[index:index] = lines[start:index]
+            text = "\n".join(lines)
+            self.assertEqual(model(parser.parse(text)), model(parse_plan(text)), f"after edit {iteration}")
+
+    def test_only_changed_sections_are_reparsed(self):
+        text = generated_plan(5, 3)
+        parser = IncrementalPlanParser()
+        parser.parse(text)
+        self.assertEqual(parser.reparsed, parser.section_count)
+
+        edited = text.replace("**Step 3.2**: Task 2", "**Step 3.2**: Task 2 renamed")
+        self.assertEqual(model(parser.parse(edited)), model(parse_plan(edited)))
+        self.assertEqual(parser.reparsed, 1)
+
+        shifted = "# Generated plan\n\nIntro line\n" + edited[len("# Generated plan\n"):]
+        self.assertEqual(model(parser.parse(shifted)), model(parse_plan(shifted)))
+        self.assertEqual(parser.reparsed, 1)
+
+PARALLEL_PLAN = """# Plan
+
+## Phase 1: Backend
+
+- [x] **Step 1.1**: Schema (~2h)
+- [ ] **Step 1.2**: API (~4h)
+  - **Dependencies**: Step 1.1
+
+## Phase 2: Frontend
+
+- [ ] **Step 2.1**: Pages (~3h)
+  - **Dependencies**: Step 1.1
+- [ ] **Step 2.2**: Forms (~1h)
+
+## Phase 3: Release
+
+**Dependencies**: Phase 1, Phase 2
+
+- [ ] **Step 3.1**: Ship (~1h)
+"""
+
+CYCLIC_PLAN = """# Plan
+
+## Phase 1: Build
+
+- [ ] **Step 1.1**: Config
+  - **Dependencies**: Step 1.3
+- [ ] **Step 1.2**: Code
+- [ ] **Step 1.3**: Wire
+- [ ] **Step 1.4**: Package
+"""
+
+class ScheduleTest(unittest.TestCase):
+    def test_levels_and_critical_path(self):
+        schedule = graph(PARALLEL_PLAN).schedule()
+
+        self.assertEqual(schedule["levels"], [["1.1"], ["1.2", "2.1"], ["2.2"], ["3.1"]])
+        self.assertEqual(schedule["max_parallelism"], 2)
+        self.assertEqual(schedule["unit"], "hours")
+        self.assertEqual(schedule["critical_path"], {"nodes": ["1.1", "1.2", "3.1"], "length": 7})
+        self.assertEqual(schedule["cycles"], [])
+        self.assertEqual(schedule["unschedulable"], [])
+
+    def test_remaining_leaves_done_steps_out(self):
+        schedule = graph(PARALLEL_PLAN).schedule(remaining=True)
+
+        self.assertEqual(schedule["levels"], [["1.2", "2.1"], ["2.2"], ["3.1"]])
+        self.assertEqual(schedule["critical_path"], {"nodes": ["1.2", "3.1"], "length": 5})
+
+    def test_cycles_are_reported_and_unschedulable(self):
+        result = graph(CYCLIC_PLAN)
+        schedule = result.schedule()
+
+        self.assertEqual(result.cycles(), [["1.1", "1.2", "1.3"]])
+        self.assertEqual(schedule["levels"], [])
+        self.assertEqual(schedule["unschedulable"], ["1.1", "1.2", "1.3", "1.4"])
+
+    def test_cycles_and_dangling_references_are_diagnostics(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "Plan.md"
+            path.write_text(CYCLIC_PLAN.replace("Step 1.3", "Step 1.3, Step 4.2"), encoding="utf-8")
+            validator = PlanValidator(str(path))
+
+            self.assertFalse(validator.validate())
+        self.assertEqual(validator.errors[-1], "Line 5: Dependency cycle: Step 1.1 → Step 1.2 → Step 1.3 → Step 1.1")
+        self.assertIn("Line 6: Step 1.1 depends on unknown Step 4.2", validator.warnings)
+
+    def test_dangling_references_are_in_the_schedule(self):
+        schedule = graph(TWO_PHASES.format(declaration="Phase 4")).schedule()
+
+        self.assertEqual(schedule["dangling"], [{"id": "2.1", "reference": "Phase 4", "line": 11}])
+        self.assertEqual(schedule["levels"], [["1.1"], ["1.2"], ["2.1"], ["2.2"]])
+
+if __name__ == "__main__":
+    unittest.main()
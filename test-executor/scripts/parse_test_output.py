@@ -5,22 +5,179 @@ Test Output Parser
 Parses test output from various testing frameworks into structured format.
 Framework-agnostic: supports Jest, pytest, dotnet test, Go test, Cargo test, etc.
 
+Output is processed line by line in a single pass, so arbitrarily large logs
+can be parsed. Framework sections are recognized as they appear (e.g. a CI job
+running pytest then Playwright) and each section's lines are routed to the
+matching parser; mixed logs report "framework": "mixed" with per-framework
+sub-summaries under "frameworks". Each test record carries the framework
+that produced it.
+
+Structured reports (JUnit XML, TAP, `go test -json`) are recognized from their
+first line and parsed incrementally with exact per-test durations.
+
 Usage:
     python parse_test_output.py <test-output-file>
     cat test-output.txt | python parse_test_output.py
+    python parse_test_output.py --stream huge-ci-log.txt
+    python parse_test_output.py --jobs 8 huge-ci-log.txt
+    python parse_test_output.py junit-report.xml
+    go test -json ./... | python parse_test_output.py
+
+Options:
+    --stream    Write per-test records as they are parsed instead of buffering
+                them (constant memory, same JSON keys; "framework" and
+                "summary" come last)
+    --jobs N    Memory-map the file and parse line-aligned chunks in N worker
+                processes (file input only; output is identical to the serial
+                path). Files under 16 MiB are parsed serially, where the
+                process overhead outweighs the parallel speedup
+    --format F  Input format: auto (default), console, junit, tap, go-json
+    --history DB
+                Also append the results to a test history database
+                (see test_history.py), keyed by --commit (default: HEAD)
 
 Output: JSON with parsed test results
 """
 
+import io
+import os
 import sys
 import re
 import json
-from typing import Dict, List, Any, Optional
+import mmap
+import argparse
+import itertools
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable, Iterator, TextIO, Union
 from pathlib import Path
 
+# Lines buffered before the first section marker; past this, the framework of
+# the leading output is guessed from these lines
+DETECT_PREFIX_LINES = 2000
+
+# Chunks per worker in --jobs mode (evens out uneven chunks), and minimum chunk size
+CHUNKS_PER_JOB = 4
+MIN_CHUNK_BYTES = 1 << 20
+# Smaller files are parsed serially even with --jobs (see --jobs above)
+PARALLEL_MIN_BYTES = 16 << 20
+
+# Framework -> parser suffix (_parse_<suffix> / _summarize_<suffix>)
+PARSERS = {
+    "jest": "jest",
+    "vitest": "jest",  # Vitest uses similar format
+    "pytest": "pytest",
+    "dotnet": "dotnet",
+    "go": "go",
+    "cargo": "cargo",
+    "playwright": "playwright",
+    "junit": "junit",
+    "tap": "tap",
+    "go-json": "go_json",
+    "unknown": "generic"
+}
+
+# Structured report formats (--format values besides auto/console)
+REPORT_FORMATS = ["junit", "tap", "go-json"]
+
+# Formats that must be parsed by a single worker in --jobs mode
+UNSPLITTABLE = {"junit", "tap"}
+
+# Lines that open a framework section, matched at the start of each line.
+# ASCII-only so the same patterns can scan raw bytes in --jobs mode. Vitest
+# failure headers ("FAIL  src/a.test.ts > suite > test") are not Jest markers.
+SECTION_MARKERS = [
+    ("pytest", r'=+ test session starts =+|[^ \t\r\n]+\.py::[^ \t\r\n]+[ \t]+(?:PASSED|FAILED|SKIPPED|ERROR)'),
+    ("jest", r'[ \t]*(?:PASS|FAIL)[ \t]+[^ \t\r\n]+\.[cm]?[jt]sx?(?![^ \t\r\n]|[ \t]+>)|Test Suites:'),
+    ("vitest", r'[ \t]*RUN[ \t]+v[0-9]|[ \t]*Test Files[ \t]'),
+    ("dotnet", r'Starting test execution|A total of [0-9]+ test files? matched|(?:Passed|Failed)![ \t]+-'),
+    ("go", r'=== RUN[ \t]|[ \t]*--- (?:PASS|FAIL|SKIP):'),
+    ("cargo", r'running [0-9]+ tests?\r?$|test result: '),
+    ("playwright", r'Running [0-9]+ tests? using [0-9]+ workers?')
+]
+SECTION_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_MARKERS))
+SECTION_RE_BYTES = re.compile(
+    ("^(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_MARKERS) + ")").encode(),
+    re.MULTILINE
+)
+
+# Durations such as "3.42s", "45ms", "2 s", "1.5m"
+DURATION_RE = re.compile(r'^\s*([\d.]+)\s*(ms|s|m|h)?\s*$')
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+# JUnit XML: <testcase> children marking a non-passing result
+JUNIT_STATUSES = {"failure": "failed", "error": "failed", "skipped": "skipped"}
+# JUnit XML: root/suite names written by test runners -> framework of their tests
+JUNIT_SUITE_ORIGINS = {"pytest": "pytest", "pytest tests": "pytest", "jest tests": "jest", "vitest tests": "vitest"}
+
+# TAP: "ok 1 - name", "not ok 2 - name # SKIP reason", YAML "duration_ms: 12"
+TAP_TEST_RE = re.compile(r'(not )?ok\b\s*(?:\d+)?\s*(?:-\s*)?(.*?)\s*(?:#\s*(\w+).*)?$')
+TAP_DURATION_RE = re.compile(r'\s+duration_ms:\s*([\d.]+)')
+TAP_TOTAL_DURATION_RE = re.compile(r'#\s*duration_ms\s+([\d.]+)')
+# First line of a TAP stream: version, plan or numbered / described test point
+# (not a bare "ok", which is also how plain go test reports a package)
+TAP_START_RE = re.compile(r'TAP version|1\.\.\d+|(?:not )?ok(?: \d+| -)')
+
+# go test -json actions for finished tests and packages
+GO_JSON_STATUSES = {"pass": "passed", "fail": "failed", "skip": "skipped"}
+
+# Jest: "Tests: 2 passed, 2 total", "Time: 2.5 s", "✓ test name (45 ms)"
+JEST_TESTS_RE = re.compile(
+    r'Tests:\s*(?:(\d+)\s+failed,\s*)?(?:(\d+)\s+passed,\s*)?(?:(\d+)\s+skipped,\s*)?(\d+)\s+total'
+)
+JEST_TIME_RE = re.compile(r'Time:\s*([\d.]+)\s*(s)')
+# Vitest: "      Tests  1 failed | 3 passed (4)", "   Duration  412ms (transform 45ms, ...)"
+VITEST_TESTS_RE = re.compile(
+    r'^\s*Tests\s+(?:(\d+) failed)?[\s|]*(?:(\d+) passed)?[\s|]*(?:(\d+) skipped)?[^(]*\((\d+)\)'
+)
+VITEST_DURATION_RE = re.compile(r'^\s*Duration\s+([\d.]+)\s*(ms|s)\b')
+JEST_TEST_RE = re.compile(r'([✓✗])\s+(.+?)\s+\((\d+)\s*ms\)')
+# Test file header: "PASS  tests/unit/EmailService.test.ts (5.1 s)"
+JEST_FILE_PATTERN = r'[ \t]*(?:PASS|FAIL)[ \t]+([^ \t\r\n]+\.[cm]?[jt]sx?)(?![^ \t\r\n])'
+JEST_FILE_RE = re.compile(JEST_FILE_PATTERN)
+JEST_FILE_RE_BYTES = re.compile(JEST_FILE_PATTERN.encode())
+
+# pytest: "5 passed, 2 failed in 3.42s", "tests/test_file.py::test_function PASSED"
+PYTEST_SUMMARY_RE = re.compile(
+    r'(?:(\d+)\s+failed,?\s*)?(?:(\d+)\s+passed,?\s*)?(?:(\d+)\s+skipped,?\s*)?in\s+([\d.]+)s'
+)
+PYTEST_TEST_RE = re.compile(r'([\w/\\.]+\.py)::([\w_]+)\s+(PASSED|FAILED|SKIPPED)')
+
+# dotnet: "Failed: 0, Passed: 10, Skipped: 0, Total: 10, Duration: 2 s", "Passed TestName"
+DOTNET_SUMMARY_RE = re.compile(
+    r'Failed:\s*(\d+),\s*Passed:\s*(\d+),\s*Skipped:\s*(\d+),\s*Total:\s*(\d+),\s*Duration:\s*([\d.]+)\s*s'
+)
+DOTNET_TEST_RE = re.compile(r'(Passed|Failed|Skipped)\s+([\w\.]+)')
+
+# Go: "--- PASS: TestName (0.00s)", "ok  	package	0.123s"
+GO_TEST_RE = re.compile(r'---\s+(PASS|FAIL):\s+([\w]+)\s+\(([\d.]+)s\)')
+GO_DURATION_RE = re.compile(r'ok\s+[\w/]+\s+([\d.]+)s')
+
+# Cargo: "test result: ok. 5 passed; 0 failed; 0 ignored", "test test_name ... ok"
+CARGO_SUMMARY_RE = re.compile(r'test result:.*?(\d+)\s+passed;\s*(\d+)\s+failed;\s*(\d+)\s+ignored')
+CARGO_TEST_RE = re.compile(r'test\s+([\w:]+)\s+\.\.\.\s+(ok|FAILED)')
+
+# Playwright: "5 passed (3s)", "1 failed"
+PLAYWRIGHT_PASSED_RE = re.compile(r'(\d+)\s+passed\s+\(([^)]+)\)')
+PLAYWRIGHT_FAILED_RE = re.compile(r'(\d+)\s+failed')
+
+GENERIC_PASS_RE = re.compile(r'\bpass(?:ed)?\b', re.IGNORECASE)
+GENERIC_FAIL_RE = re.compile(r'\bfail(?:ed)?\b', re.IGNORECASE)
+
 class TestOutputParser:
-    def __init__(self, output: str):
+    def __init__(self, output: Union[str, Path, Iterable[str]], detect_lines: int = DETECT_PREFIX_LINES,
+                 jobs: int = 1, framework: Optional[str] = None, detect_reports: bool = True):
+        # The full output, a file path, or an iterable of lines (e.g. an open file)
         self.output = output
+        self.detect_lines = detect_lines
+        self.jobs = jobs
+        self.detect_reports = detect_reports
+        # A fixed framework disables section detection
+        self.framework = None
+        # Framework -> sub-parser, in order of first appearance
+        self.sections: Dict[str, "TestOutputParser"] = {}
+        if framework is not None:
+            self._use_framework(framework)
         self.results = {
             "framework": "unknown",
             "summary": {
@@ -32,35 +189,225 @@ class TestOutputParser:
             },
             "tests": []
         }
+        # First match of each summary pattern, and running counters
+        self._captures: Dict[str, tuple] = {}
+        self._counts: Dict[str, int] = {"passed": 0, "failed": 0, "skipped": 0}
+        # Test file of the Jest tests being parsed
+        self._jest_file: Optional[str] = None
+        # Incremental XML parser and open elements (JUnit)
+        self._xml: Optional[ET.XMLPullParser] = None
+        self._xml_stack: List[ET.Element] = []
+        # Framework that wrote the JUnit report, once recognized
+        self._junit_origin: Optional[str] = None
+        # TAP test waiting for its YAML diagnostics, and whether we are inside them
+        self._tap_pending: Optional[Dict[str, Any]] = None
+        self._tap_yaml = False
 
     def parse(self) -> Dict[str, Any]:
         """Parse test output and return structured results."""
-        # Detect framework
-        self.results["framework"] = self._detect_framework()
-
-        # Parse based on framework
-        if self.results["framework"] == "jest":
-            self._parse_jest()
-        elif self.results["framework"] == "pytest":
-            self._parse_pytest()
-        elif self.results["framework"] == "dotnet":
-            self._parse_dotnet()
-        elif self.results["framework"] == "go":
-            self._parse_go()
-        elif self.results["framework"] == "cargo":
-            self._parse_cargo()
-        elif self.results["framework"] == "vitest":
-            self._parse_vitest()
-        elif self.results["framework"] == "playwright":
-            self._parse_playwright()
-        else:
-            self._parse_generic()
-
+        self.results["tests"].extend(self.iter_tests())
         return self.results
 
-    def _detect_framework(self) -> str:
+    def iter_tests(self) -> Iterator[Dict[str, Any]]:
+        """Yield per-test records as they are parsed.
+
+        The summary in self.results is filled in once the iterator is exhausted.
+        """
+        if isinstance(self.output, Path):
+            if self.jobs > 1 and self.output.stat().st_size >= PARALLEL_MIN_BYTES:
+                if self.framework is None and self.detect_reports:
+                    with open(self.output, encoding='utf-8') as f:
+                        self._sniff_report(f)
+                yield from self._iter_tests_parallel(self.output)
+                return
+            with open(self.output, encoding='utf-8') as f:
+                yield from self._iter_tests_serial(f)
+        elif isinstance(self.output, str):
+            yield from self._iter_tests_serial(io.StringIO(self.output))
+        else:
+            yield from self._iter_tests_serial(self.output)
+
+    def summarize(self) -> Dict[str, Any]:
+        """Fill in and return the summary of a fixed-framework parser."""
+        getattr(self, f"_summarize_{PARSERS[self.framework]}")()
+        return self.results["summary"]
+
+    def finish(self) -> Iterator[Dict[str, Any]]:
+        """Yield records a fixed-framework parser still holds at end of input."""
+        finisher = getattr(self, f"_finish_{PARSERS[self.framework]}", None)
+        if finisher:
+            yield from finisher()
+
+    def _use_framework(self, framework: str):
+        self.framework = framework
+        self.parse_line = getattr(self, f"_parse_{PARSERS[framework]}")
+
+    def _sniff_report(self, lines: Iterable[str]) -> Iterator[str]:
+        """Switch to a structured report format if the first non-blank line is one.
+
+        Returns an iterator over all lines, including those read to decide.
+        """
+        lines = iter(lines)
+        head: List[str] = []
+        for line in lines:
+            head.append(line)
+            if line.strip() or len(head) >= self.detect_lines:
+                break
+
+        first = head[-1].lstrip("\ufeff \t") if head else ""
+        if first.startswith(("<?xml", "<testsuites", "<testsuite")):
+            self._use_framework("junit")
+        elif TAP_START_RE.match(first):
+            self._use_framework("tap")
+        elif first.startswith("{") and '"Action"' in first:
+            self._use_framework("go-json")
+
+        return itertools.chain(head, lines)
+
+    def _section(self, framework: str) -> "TestOutputParser":
+        """Return the sub-parser collecting the lines of one framework."""
+        if framework not in self.sections:
+            self.sections[framework] = TestOutputParser((), framework=framework)
+        return self.sections[framework]
+
+    def _iter_tests_serial(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        if self.framework is None and self.detect_reports:
+            lines = self._sniff_report(lines)
+
+        if self.framework is not None:
+            self.results["framework"] = self.framework
+            for line in lines:
+                yield from self.parse_line(line)
+            yield from self.finish()
+            self.summarize()
+            return
+
+        # Lines seen before the first section marker
+        pending: List[str] = []
+        section = None
+
+        for line in lines:
+            marker = SECTION_RE.match(line)
+            if marker and (section is None or marker.lastgroup != section.framework):
+                section = self._section(marker.lastgroup)
+                for pending_line in pending:
+                    yield from section.parse_line(pending_line)
+                pending = []
+            elif section is None:
+                pending.append(line)
+                if len(pending) >= self.detect_lines:
+                    # No marker so far: guess the leading output's framework
+                    section = self._section(self._detect_framework("".join(pending)))
+                    for pending_line in pending:
+                        yield from section.parse_line(pending_line)
+                    pending = []
+                continue
+
+            yield from section.parse_line(line)
+
+        if section is None:
+            section = self._section(self._detect_framework("".join(pending)))
+            for pending_line in pending:
+                yield from section.parse_line(pending_line)
+
+        for section in self.sections.values():
+            yield from section.finish()
+        self._merge_sections()
+
+    def _iter_tests_parallel(self, path: Path) -> Iterator[Dict[str, Any]]:
+        """Parse line-aligned chunks of a memory-mapped file in worker processes.
+
+        Workers first scan their chunk for section markers; sections are then
+        split into chunks parsed with a known framework. Chunk results are
+        merged in file order (tests concatenated, first summary matches win,
+        counters summed), which gives exactly the serial result.
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                yield from self._iter_tests_serial(())
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                step = max(size // (self.jobs * CHUNKS_PER_JOB), MIN_CHUNK_BYTES)
+
+                if self.framework is not None:
+                    sections = [(0, size, self.framework)]
+                else:
+                    scans = [(str(path), start, end) for start, end in _chunk_bounds(mm, 0, size, step)]
+                    markers = [marker for chunk in executor.map(_scan_chunk, scans) for marker in chunk]
+                    sections = self._plan_sections(mm, markers)
+
+                tasks = [
+                    (str(path), start, end, framework,
+                     _last_jest_file(mm, start) if framework == "jest" else None)
+                    for section_start, section_end, framework in sections
+                    for start, end in _chunk_bounds(
+                        mm, section_start, section_end,
+                        section_end - section_start if framework in UNSPLITTABLE else step
+                    )
+                ]
+
+                for framework, (tests, captures, counts) in zip(
+                    (task[3] for task in tasks), executor.map(_parse_chunk, tasks)
+                ):
+                    section = self if self.framework is not None else self._section(framework)
+                    for key, groups in captures.items():
+                        section._captures.setdefault(key, groups)
+                    for key, count in counts.items():
+                        section._counts[key] = section._counts.get(key, 0) + count
+                    yield from tests
+
+        if self.framework is not None:
+            self.results["framework"] = self.framework
+            self.summarize()
+        else:
+            self._merge_sections()
+
+    def _plan_sections(self, mm: mmap.mmap, markers: List[tuple]) -> List[tuple]:
+        """Turn (offset, framework) markers into (start, end, framework) sections.
+
+        Mirrors the serial path: output before the first marker joins the first
+        section, unless the marker lies beyond the detection prefix.
+        """
+        prefix_end = 0
+        for _ in range(self.detect_lines):
+            newline = mm.find(b'\n', prefix_end)
+            if newline == -1:
+                prefix_end = len(mm)
+                break
+            prefix_end = newline + 1
+
+        starts: List[tuple] = []
+        if not markers or markers[0][0] >= prefix_end:
+            prefix = "".join(io.StringIO(mm[:prefix_end].decode('utf-8'), newline=None))
+            starts.append((0, self._detect_framework(prefix)))
+        for offset, framework in markers:
+            if not starts:
+                starts.append((0, framework))
+            elif framework != starts[-1][1]:
+                starts.append((offset, framework))
+
+        ends = [start for start, _ in starts[1:]] + [len(mm)]
+        return [(start, end, framework) for (start, framework), end in zip(starts, ends)]
+
+    def _merge_sections(self):
+        """Combine per-framework results; mixed logs keep per-framework summaries."""
+        # Word counts of unrecognized output only matter when nothing else was found
+        frameworks = [name for name in self.sections if name != "unknown"] or list(self.sections)
+        summaries = {name: self._section(name).summarize() for name in frameworks}
+
+        if len(summaries) == 1:
+            self.results["framework"], self.results["summary"] = next(iter(summaries.items()))
+        elif summaries:
+            self.results["framework"] = "mixed"
+            self.results["summary"] = merge_summaries(list(summaries.values()))
+            self.results["frameworks"] = summaries
+
+    def _detect_framework(self, text: str) -> str:
         """Detect testing framework from output."""
-        output_lower = self.output.lower()
+        output_lower = text.lower()
 
         if "jest" in output_lower or "test suites:" in output_lower:
             return "jest"
@@ -79,195 +426,510 @@ class TestOutputParser:
         else:
             return "unknown"
 
-    def _parse_jest(self):
-        """Parse Jest/Vitest output."""
-        # Summary line: "Test Suites: 1 passed, 1 total"
-        summary_match = re.search(
-            r'Test Suites:\s*(?:(\d+)\s+failed,\s*)?(?:(\d+)\s+passed,\s*)?(\d+)\s+total',
-            self.output
-        )
-        if summary_match:
-            failed_suites = int(summary_match.group(1) or 0)
-            passed_suites = int(summary_match.group(2) or 0)
-
-        # Tests line: "Tests: 2 passed, 2 total"
-        tests_match = re.search(
-            r'Tests:\s*(?:(\d+)\s+failed,\s*)?(?:(\d+)\s+passed,\s*)?(?:(\d+)\s+skipped,\s*)?(\d+)\s+total',
-            self.output
-        )
-        if tests_match:
-            self.results["summary"]["failed"] = int(tests_match.group(1) or 0)
-            self.results["summary"]["passed"] = int(tests_match.group(2) or 0)
-            self.results["summary"]["skipped"] = int(tests_match.group(3) or 0)
-            self.results["summary"]["total"] = int(tests_match.group(4))
-
-        # Duration: "Time: 2.5 s"
-        duration_match = re.search(r'Time:\s*([\d.]+)\s*s', self.output)
-        if duration_match:
-            self.results["summary"]["duration"] = f"{duration_match.group(1)}s"
-
-        # Individual tests: "✓ test name (45 ms)"
-        test_pattern = r'([✓✗])\s+(.+?)\s+\((\d+)\s*ms\)'
-        for match in re.finditer(test_pattern, self.output):
+    def _capture(self, key: str, needle: str, pattern: re.Pattern, line: str):
+        """Remember the groups of the first line matching pattern."""
+        if key not in self._captures and needle in line:
+            match = pattern.search(line)
+            if match:
+                self._captures[key] = match.groups()
+
+    def _parse_jest(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Parse a line of Jest/Vitest output."""
+        self._capture("tests", "Tests:", JEST_TESTS_RE, line)
+        self._capture("duration", "Time:", JEST_TIME_RE, line)
+        if self.framework == "vitest":
+            self._capture("tests", "Tests ", VITEST_TESTS_RE, line)
+            self._capture("duration", "Duration", VITEST_DURATION_RE, line)
+
+        if "PASS" in line or "FAIL" in line:
+            match = JEST_FILE_RE.match(line)
+            if match:
+                self._jest_file = match.group(1)
+
+        for match in JEST_TEST_RE.finditer(line):
             status = "passed" if match.group(1) == "✓" else "failed"
-            self.results["tests"].append({
+            test = {
                 "name": match.group(2).strip(),
                 "status": status,
-                "duration": f"{match.group(3)}ms"
-            })
-
-    def _parse_pytest(self):
-        """Parse pytest output."""
-        # Summary: "5 passed, 2 failed in 3.42s"
-        summary_match = re.search(
-            r'(?:(\d+)\s+failed,?\s*)?(?:(\d+)\s+passed,?\s*)?(?:(\d+)\s+skipped,?\s*)?in\s+([\d.]+)s',
-            self.output
-        )
-        if summary_match:
-            self.results["summary"]["failed"] = int(summary_match.group(1) or 0)
-            self.results["summary"]["passed"] = int(summary_match.group(2) or 0)
-            self.results["summary"]["skipped"] = int(summary_match.group(3) or 0)
-            self.results["summary"]["total"] = (
-                self.results["summary"]["failed"] +
-                self.results["summary"]["passed"] +
-                self.results["summary"]["skipped"]
-            )
-            self.results["summary"]["duration"] = f"{summary_match.group(4)}s"
-
-        # Individual tests: "tests/test_file.py::test_function PASSED"
-        test_pattern = r'([\w/\\.]+\.py)::([\w_]+)\s+(PASSED|FAILED|SKIPPED)'
-        for match in re.finditer(test_pattern, self.output):
-            self.results["tests"].append({
-                "name": f"{match.group(1)}::{match.group(2)}",
-                "status": match.group(3).lower(),
-                "duration": None
-            })
-
-    def _parse_dotnet(self):
-        """Parse dotnet test output."""
-        # Summary: "Passed! - Failed: 0, Passed: 10, Skipped: 0, Total: 10, Duration: 2 s"
-        summary_match = re.search(
-            r'Failed:\s*(\d+),\s*Passed:\s*(\d+),\s*Skipped:\s*(\d+),\s*Total:\s*(\d+),\s*Duration:\s*([\d.]+)\s*s',
-            self.output
-        )
-        if summary_match:
-            self.results["summary"]["failed"] = int(summary_match.group(1))
-            self.results["summary"]["passed"] = int(summary_match.group(2))
-            self.results["summary"]["skipped"] = int(summary_match.group(3))
-            self.results["summary"]["total"] = int(summary_match.group(4))
-            self.results["summary"]["duration"] = f"{summary_match.group(5)}s"
-
-        # Individual tests: "Passed TestName"
-        test_pattern = r'(Passed|Failed|Skipped)\s+([\w\.]+)'
-        for match in re.finditer(test_pattern, self.output):
-            self.results["tests"].append({
+                "duration": f"{match.group(3)}ms",
+                "framework": self.framework
+            }
+            if self._jest_file:
+                test["file"] = self._jest_file
+            yield test
+
+    def _summarize_jest(self):
+        summary = self.results["summary"]
+        tests = self._captures.get("tests")
+        if tests:
+            summary["failed"] = int(tests[0] or 0)
+            summary["passed"] = int(tests[1] or 0)
+            summary["skipped"] = int(tests[2] or 0)
+            summary["total"] = int(tests[3])
+
+        duration = self._captures.get("duration")
+        if duration:
+            summary["duration"] = f"{duration[0]}{duration[1]}"
+
+    def _parse_pytest(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Parse a line of pytest output."""
+        self._capture("summary", "in", PYTEST_SUMMARY_RE, line)
+
+        if "::" in line:
+            for match in PYTEST_TEST_RE.finditer(line):
+                yield {
+                    "name": f"{match.group(1)}::{match.group(2)}",
+                    "status": match.group(3).lower(),
+                    "duration": None,
+                    "framework": self.framework
+                }
+
+    def _summarize_pytest(self):
+        summary = self.results["summary"]
+        captured = self._captures.get("summary")
+        if captured:
+            summary["failed"] = int(captured[0] or 0)
+            summary["passed"] = int(captured[1] or 0)
+            summary["skipped"] = int(captured[2] or 0)
+            summary["total"] = summary["failed"] + summary["passed"] + summary["skipped"]
+            summary["duration"] = f"{captured[3]}s"
+
+    def _parse_dotnet(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Parse a line of dotnet test output."""
+        self._capture("summary", "Failed:", DOTNET_SUMMARY_RE, line)
+
+        for match in DOTNET_TEST_RE.finditer(line):
+            yield {
                 "name": match.group(2),
                 "status": match.group(1).lower(),
-                "duration": None
-            })
-
-    def _parse_go(self):
-        """Parse Go test output."""
-        # Summary: "PASS" or "FAIL"
-        if "PASS" in self.output and "FAIL" not in self.output:
-            # All passed
-            pass
-
-        # Individual tests: "--- PASS: TestName (0.00s)"
-        test_pattern = r'---\s+(PASS|FAIL):\s+([\w]+)\s+\(([\d.]+)s\)'
-        for match in re.finditer(test_pattern, self.output):
-            status = "passed" if match.group(1) == "PASS" else "failed"
-            self.results["tests"].append({
-                "name": match.group(2),
-                "status": status,
-                "duration": f"{match.group(3)}s"
-            })
-
-            if status == "passed":
-                self.results["summary"]["passed"] += 1
+                "duration": None,
+                "framework": self.framework
+            }
+
+    def _summarize_dotnet(self):
+        summary = self.results["summary"]
+        captured = self._captures.get("summary")
+        if captured:
+            summary["failed"] = int(captured[0])
+            summary["passed"] = int(captured[1])
+            summary["skipped"] = int(captured[2])
+            summary["total"] = int(captured[3])
+            summary["duration"] = f"{captured[4]}s"
+
+    def _parse_go(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Parse a line of Go test output."""
+        self._capture("duration", "ok", GO_DURATION_RE, line)
+
+        if "---" in line:
+            for match in GO_TEST_RE.finditer(line):
+                status = "passed" if match.group(1) == "PASS" else "failed"
+                self._counts[status] += 1
+                yield {
+                    "name": match.group(2),
+                    "status": status,
+                    "duration": f"{match.group(3)}s",
+                    "framework": self.framework
+                }
+
+    def _summarize_go(self):
+        summary = self.results["summary"]
+        summary["passed"] = self._counts["passed"]
+        summary["failed"] = self._counts["failed"]
+        summary["total"] = summary["passed"] + summary["failed"]
+
+        duration = self._captures.get("duration")
+        if duration:
+            summary["duration"] = f"{duration[0]}s"
+
+    def _parse_cargo(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Parse a line of Cargo test output."""
+        self._capture("summary", "test result:", CARGO_SUMMARY_RE, line)
+
+        if "..." in line:
+            for match in CARGO_TEST_RE.finditer(line):
+                status = "passed" if match.group(2) == "ok" else "failed"
+                yield {
+                    "name": match.group(1),
+                    "status": status,
+                    "duration": None,
+                    "framework": self.framework
+                }
+
+    def _summarize_cargo(self):
+        summary = self.results["summary"]
+        captured = self._captures.get("summary")
+        if captured:
+            summary["passed"] = int(captured[0])
+            summary["failed"] = int(captured[1])
+            summary["skipped"] = int(captured[2])
+            summary["total"] = summary["passed"] + summary["failed"] + summary["skipped"]
+
+    def _parse_playwright(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Parse a line of Playwright output (summary only)."""
+        self._capture("passed", "passed", PLAYWRIGHT_PASSED_RE, line)
+        self._capture("failed", "failed", PLAYWRIGHT_FAILED_RE, line)
+        return iter(())
+
+    def _summarize_playwright(self):
+        summary = self.results["summary"]
+        passed = self._captures.get("passed")
+        if passed:
+            summary["passed"] = int(passed[0])
+            summary["total"] = int(passed[0])
+            summary["duration"] = passed[1]
+
+        failed = self._captures.get("failed")
+        if failed:
+            summary["failed"] = int(failed[0])
+            summary["total"] += summary["failed"]
+
+    def _parse_junit(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Feed a line of JUnit XML, yielding each <testcase> once it is closed.
+
+        Finished testcases and testsuites are detached from their parent so
+        memory stays bounded however large the report is.
+        """
+        if self._xml is None:
+            self._xml = ET.XMLPullParser(events=("start", "end"))
+        self._xml.feed(line)
+
+        for event, elem in self._xml.read_events():
+            if event == "start":
+                if not self._xml_stack and elem.get("time"):
+                    self._captures.setdefault("duration", (elem.get("time"),))
+                if self._junit_origin is None:
+                    self._junit_origin = _junit_origin(elem)
+                self._xml_stack.append(elem)
+                continue
+
+            self._xml_stack.pop()
+            if elem.tag == "testcase":
+                status = "passed"
+                for child in elem:
+                    if child.tag in JUNIT_STATUSES:
+                        status = JUNIT_STATUSES[child.tag]
+                        break
+                self._counts[status] += 1
+
+                yield self._junit_test(elem, status)
+            elif elem.tag == "testsuite" and len(self._xml_stack) <= 1 and elem.get("time"):
+                # Top-level suite: used when the root has no total time
+                self._counts["suite_ms"] = self._counts.get("suite_ms", 0) + _to_ms(elem.get("time"))
+
+            if elem.tag in ("testcase", "testsuite") and self._xml_stack:
+                self._xml_stack[-1].remove(elem)
+
+    def _junit_test(self, elem: ET.Element, status: str) -> Dict[str, Any]:
+        """Test record of a <testcase>, named and attributed as its runner would.
+
+        pytest tests get node IDs (tests/test_x.py::TestY::test_z) and
+        Jest/Vitest tests their file, under the framework that wrote the
+        report; tests of unrecognized runners stay "classname.name" under
+        "junit".
+        """
+        name = elem.get("name", "")
+        classname = elem.get("classname") or ""
+        time = elem.get("time")
+        test = {
+            "name": f"{classname}.{name}" if classname else name,
+            "status": status,
+            "duration": f"{time}s" if time else None,
+            "framework": self.framework
+        }
+        origin = self._junit_origin
+        if origin == "pytest":
+            test["name"] = _pytest_node_id(classname, name, elem.get("file"))
+        elif origin in ("jest", "vitest"):
+            # Vitest names each suite after its test file
+            suite = self._xml_stack[-1].get("name") if origin == "vitest" and self._xml_stack else None
+            file = elem.get("file") or suite
+            if not file:
+                return test
+            test["file"] = file
+        if origin:
+            test["framework"] = origin
+        return test
+
+    def _summarize_junit(self):
+        self._summarize_counts()
+        duration = self._captures.get("duration")
+        if duration:
+            self.results["summary"]["duration"] = f"{duration[0]}s"
+        elif "suite_ms" in self._counts:
+            self.results["summary"]["duration"] = f"{self._counts['suite_ms'] / 1000}s"
+
+    def _parse_tap(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Parse a line of TAP; top-level test points only (subtests are indented)."""
+        if self._tap_yaml:
+            stripped = line.strip()
+            if stripped == "...":
+                self._tap_yaml = False
+                yield from self._finish_tap()
             else:
-                self.results["summary"]["failed"] += 1
-
-        self.results["summary"]["total"] = len(self.results["tests"])
-
-        # Duration: "ok  	package	0.123s"
-        duration_match = re.search(r'ok\s+[\w/]+\s+([\d.]+)s', self.output)
-        if duration_match:
-            self.results["summary"]["duration"] = f"{duration_match.group(1)}s"
-
-    def _parse_cargo(self):
-        """Parse Cargo test output."""
-        # Summary: "test result: ok. 5 passed; 0 failed; 0 ignored; 0 measured"
-        summary_match = re.search(
-            r'test result:.*?(\d+)\s+passed;\s*(\d+)\s+failed;\s*(\d+)\s+ignored',
-            self.output
-        )
-        if summary_match:
-            self.results["summary"]["passed"] = int(summary_match.group(1))
-            self.results["summary"]["failed"] = int(summary_match.group(2))
-            self.results["summary"]["skipped"] = int(summary_match.group(3))
-            self.results["summary"]["total"] = (
-                self.results["summary"]["passed"] +
-                self.results["summary"]["failed"] +
-                self.results["summary"]["skipped"]
-            )
-
-        # Individual tests: "test test_name ... ok"
-        test_pattern = r'test\s+([\w:]+)\s+\.\.\.\s+(ok|FAILED)'
-        for match in re.finditer(test_pattern, self.output):
-            status = "passed" if match.group(2) == "ok" else "failed"
-            self.results["tests"].append({
-                "name": match.group(1),
+                match = TAP_DURATION_RE.match(line)
+                if match and self._tap_pending is not None:
+                    self._tap_pending["duration"] = f"{match.group(1)}ms"
+            return
+
+        if line.strip() == "---" and line[:1] in (" ", "\t") and self._tap_pending is not None:
+            # YAML diagnostics of the previous test point
+            self._tap_yaml = True
+            return
+
+        yield from self._finish_tap()
+
+        self._capture("duration", "duration_ms", TAP_TOTAL_DURATION_RE, line)
+        if line.startswith(("ok", "not ok")):
+            match = TAP_TEST_RE.match(line.rstrip("\r\n"))
+            if match:
+                directive = (match.group(3) or "").upper()
+                if directive in ("SKIP", "TODO"):
+                    status = "skipped"
+                else:
+                    status = "failed" if match.group(1) else "passed"
+                self._tap_pending = {
+                    "name": match.group(2), "status": status, "duration": None, "framework": self.framework
+                }
+
+    def _finish_tap(self) -> Iterator[Dict[str, Any]]:
+        if self._tap_pending is not None:
+            test, self._tap_pending = self._tap_pending, None
+            self._counts[test["status"]] += 1
+            yield test
+
+    def _summarize_tap(self):
+        self._summarize_counts()
+        duration = self._captures.get("duration")
+        if duration:
+            self.results["summary"]["duration"] = f"{duration[0]}ms"
+
+    def _parse_go_json(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Parse a line of `go test -json` output (test2json events)."""
+        if '"Action"' not in line:
+            return
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return
+
+        status = GO_JSON_STATUSES.get(event.get("Action"))
+        if status is None:
+            return
+        elapsed = event.get("Elapsed")
+        if event.get("Test"):
+            self._counts[status] += 1
+            yield {
+                "name": event["Test"],
                 "status": status,
-                "duration": None
-            })
-
-    def _parse_vitest(self):
-        """Parse Vitest output (similar to Jest)."""
-        self._parse_jest()  # Vitest uses similar format
-
-    def _parse_playwright(self):
-        """Parse Playwright output."""
-        # Summary: "5 passed (3s)"
-        summary_match = re.search(r'(\d+)\s+passed\s+\(([^)]+)\)', self.output)
-        if summary_match:
-            self.results["summary"]["passed"] = int(summary_match.group(1))
-            self.results["summary"]["total"] = int(summary_match.group(1))
-            self.results["summary"]["duration"] = match.group(2)
-
-        # Failed tests
-        failed_match = re.search(r'(\d+)\s+failed', self.output)
-        if failed_match:
-            self.results["summary"]["failed"] = int(failed_match.group(1))
-            self.results["summary"]["total"] += self.results["summary"]["failed"]
-
-    def _parse_generic(self):
-        """Generic parser for unknown frameworks."""
-        # Look for common pass/fail patterns
-        pass_count = len(re.findall(r'\bpass(?:ed)?\b', self.output, re.IGNORECASE))
-        fail_count = len(re.findall(r'\bfail(?:ed)?\b', self.output, re.IGNORECASE))
-
-        self.results["summary"]["passed"] = pass_count
-        self.results["summary"]["failed"] = fail_count
-        self.results["summary"]["total"] = pass_count + fail_count
+                "duration": f"{elapsed}s" if elapsed is not None else None,
+                "framework": self.framework
+            }
+        elif elapsed is not None:
+            # Package result: total of package run times
+            self._counts["package_ms"] = self._counts.get("package_ms", 0) + _to_ms(elapsed)
+
+    def _summarize_go_json(self):
+        self._summarize_counts()
+        if "package_ms" in self._counts:
+            self.results["summary"]["duration"] = f"{self._counts['package_ms'] / 1000}s"
+
+    def _summarize_counts(self):
+        summary = self.results["summary"]
+        for key in ("passed", "failed", "skipped"):
+            summary[key] = self._counts[key]
+        summary["total"] = summary["passed"] + summary["failed"] + summary["skipped"]
+
+    def _parse_generic(self, line: str) -> Iterator[Dict[str, Any]]:
+        """Generic parser for unknown frameworks: count pass/fail words."""
+        self._counts["passed"] += len(GENERIC_PASS_RE.findall(line))
+        self._counts["failed"] += len(GENERIC_FAIL_RE.findall(line))
+        return iter(())
+
+    def _summarize_generic(self):
+        summary = self.results["summary"]
+        summary["passed"] = self._counts["passed"]
+        summary["failed"] = self._counts["failed"]
+        summary["total"] = summary["passed"] + summary["failed"]
+
+def duration_to_seconds(duration: Optional[str]) -> Optional[float]:
+    """Convert a parsed duration string ("3.42s", "45ms", "1.5m") to seconds."""
+    match = DURATION_RE.match(duration or "")
+    if not match:
+        return None
+    try:
+        return float(match.group(1)) * DURATION_UNITS[match.group(2) or "s"]
+    except ValueError:
+        return None
+
+def _junit_origin(elem: ET.Element) -> Optional[str]:
+    """Framework that wrote a JUnit report, from one of its elements (None if unknown).
+
+    pytest and the jest-junit/Vitest reporters name the report, .NET JUnit
+    loggers name suites after the test assembly, and Maven Surefire records
+    java.* properties and its schema.
+    """
+    name = elem.get("name") or ""
+    if elem.tag in ("testsuites", "testsuite"):
+        if name in JUNIT_SUITE_ORIGINS:
+            return JUNIT_SUITE_ORIGINS[name]
+        if name.endswith(".dll"):
+            return "dotnet"
+        if any("surefire" in value for value in elem.attrib.values()):
+            return "java"
+    elif elem.tag == "property" and name.startswith("java."):
+        return "java"
+    return None
+
+def _pytest_node_id(classname: str, name: str, file: Optional[str] = None) -> str:
+    """pytest node ID of a JUnit testcase: classname "tests.test_x.TestY" and
+    name "test_z" give tests/test_x.py::TestY::test_z.
+
+    Module and class parts are told apart by case (test classes are
+    capitalized); the file attribute, when present, gives the path.
+    """
+    parts = classname.split(".") if classname else []
+    split = next((i for i, part in enumerate(parts) if part[:1].isupper()), len(parts))
+    path = file or ("/".join(parts[:split]) + ".py" if split else None)
+    return "::".join(([path] if path else []) + parts[split:] + [name])
+
+def _to_ms(seconds: Union[str, float]) -> int:
+    """Whole milliseconds, so totals add up exactly whatever the order."""
+    try:
+        return round(float(seconds) * 1000)
+    except ValueError:
+        return 0
+
+def merge_summaries(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add up per-framework summaries (duration only if every one is known)."""
+    merged = {"total": 0, "passed": 0, "failed": 0, "skipped": 0, "duration": None}
+    for summary in summaries:
+        for key in ("total", "passed", "failed", "skipped"):
+            merged[key] += summary[key]
+
+    durations = [duration_to_seconds(summary["duration"]) for summary in summaries]
+    if durations and None not in durations:
+        merged["duration"] = f"{round(sum(durations), 3)}s"
+    return merged
+
+def _chunk_bounds(mm: mmap.mmap, start: int, end: int, step: int) -> List[tuple]:
+    """Split mm[start:end] into (start, end) ranges of about step bytes ending on line boundaries."""
+    bounds = []
+    while start < end:
+        newline = mm.find(b'\n', min(start + step, end) - 1, end)
+        chunk_end = end if newline == -1 else newline + 1
+        bounds.append((start, chunk_end))
+        start = chunk_end
+    return bounds
+
+def _scan_chunk(task: tuple) -> List[tuple]:
+    """Worker: find the section markers of one chunk as (offset, framework)."""
+    path, start, end = task
+    markers: List[tuple] = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for match in SECTION_RE_BYTES.finditer(mm, start, end):
+            # Only framework changes matter
+            if not markers or markers[-1][1] != match.lastgroup:
+                markers.append((match.start(), match.lastgroup))
+    return markers
+
+def _last_jest_file(mm: mmap.mmap, end: int) -> Optional[str]:
+    """Return the last Jest test file header before offset end, if any."""
+    while end > 0:
+        found = max(mm.rfind(b'PASS', 0, end), mm.rfind(b'FAIL', 0, end))
+        if found == -1:
+            return None
+        line_start = mm.rfind(b'\n', 0, found) + 1
+        match = JEST_FILE_RE_BYTES.match(mm, line_start)
+        if match and match.start(1) > found:
+            return match.group(1).decode('utf-8')
+        end = found
+    return None
+
+def _parse_chunk(task: tuple) -> tuple:
+    """Worker: parse one chunk of a file with a known framework."""
+    path, start, end, framework, jest_file = task
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode('utf-8')
+
+    # Universal newlines, as when the file is read in text mode
+    parser = TestOutputParser(io.StringIO(text, newline=None), framework=framework)
+    parser._jest_file = jest_file
+    tests = list(parser.iter_tests())
+    return tests, parser._captures, parser._counts
+
+def write_streaming_json(parser: TestOutputParser, out: TextIO,
+                         tests: Optional[Iterable[Dict[str, Any]]] = None):
+    """Write results with the same keys as parse(), without buffering the tests.
+
+    The framework(s) and summary are only known at the end of the log, so
+    they are written last.
+    """
+    out.write('{\n  "tests": [')
+    separator = "\n    "
+    for test in tests if tests is not None else parser.iter_tests():
+        out.write(separator + json.dumps(test, indent=2).replace("\n", "\n    "))
+        separator = ",\n    "
+    if separator != "\n    ":
+        out.write("\n  ")
+    out.write("]")
+
+    for key in ("framework", "summary", "frameworks"):
+        if key in parser.results:
+            value = json.dumps(parser.results[key], indent=2).replace("\n", "\n  ")
+            out.write(f',\n  "{key}": {value}')
+    out.write("\n}\n")
 
 def main():
-    if len(sys.argv) > 1:
+    parser = argparse.ArgumentParser(description="Parse test output into structured JSON")
+    parser.add_argument("file", nargs="?", help="Test output file (default: stdin)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write per-test records as they are parsed (constant memory)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Parse the file in N worker processes (default: 1; files under 16 MiB are parsed serially)")
+    parser.add_argument("--format", choices=["auto", "console"] + REPORT_FORMATS, default="auto",
+                        help="Input format (default: auto-detect)")
+    parser.add_argument("--history", help="Append results to this test history database")
+    parser.add_argument("--commit", help="Commit recorded with --history (default: current HEAD)")
+
+    args = parser.parse_args()
+
+    if args.file:
         # Read from file
-        file_path = Path(sys.argv[1])
+        file_path = Path(args.file)
         if not file_path.exists():
             print(f"Error: File not found: {file_path}", file=sys.stderr)
             sys.exit(1)
-        output = file_path.read_text(encoding='utf-8')
+        source = file_path
+    elif args.jobs > 1:
+        print("Error: --jobs requires a file argument", file=sys.stderr)
+        sys.exit(1)
     else:
         # Read from stdin
-        output = sys.stdin.read()
+        source = sys.stdin
+
+    test_parser = TestOutputParser(
+        source,
+        jobs=args.jobs,
+        framework=args.format if args.format in REPORT_FORMATS else None,
+        detect_reports=args.format == "auto"
+    )
+    tests = test_parser.iter_tests()
+    history = None
+    if args.history:
+        from test_history import TestHistory, current_commit
+        history = TestHistory(args.history)
+        tests = history.record(tests, test_parser.results, args.commit or current_commit())
+
+    if args.stream:
+        write_streaming_json(test_parser, sys.stdout, tests)
+    else:
+        test_parser.results["tests"].extend(tests)
 
-    parser = TestOutputParser(output)
-    results = parser.parse()
+        # Output as JSON
+        print(json.dumps(test_parser.results, indent=2))
 
-    # Output as JSON
-    print(json.dumps(results, indent=2))
+    if history:
+        history.close()
 
 if __name__ == "__main__":
     main()
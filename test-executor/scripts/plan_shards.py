@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Duration-Aware Test Shard Planner
+
+Splits tests across CI workers so every shard takes about the same time,
+using durations from the test history store (test_history.py) or from
+parse_test_output.py JSON results. Assignment uses LPT (longest processing
+time first): units are sorted by duration and each goes to the least loaded
+shard.
+
+Shard units follow what each runner can select:
+- pytest: node IDs (tests/test_x.py::test_name)
+- Jest/Vitest: test files (per-test durations summed per file)
+- Go: top-level test names (go test -run)
+- Java (Maven Surefire): Class#method (mvn test -Dtest)
+- others: test names
+
+Tests from JUnit XML reports are sharded under the framework that wrote
+the report (see parse_test_output.py); reports of unrecognized runners
+get test names without a command.
+
+Usage:
+    python plan_shards.py --workers 8 --history .test-history.db
+    python plan_shards.py --workers 4 results-1.json results-2.json
+
+Output: JSON with per-shard selectors and a simulated makespan report
+"""
+
+import sys
+import json
+import heapq
+import argparse
+from typing import Dict, List, Any, Optional, Tuple
+from pathlib import Path
+
+from parse_test_output import duration_to_seconds
+
+# Framework names as recorded -> selector family
+SELECTOR_FAMILIES = {
+    "pytest": "pytest",
+    "jest": "jest",
+    "vitest": "vitest",
+    "go": "go",
+    "go-json": "go",
+    "cargo": "cargo",
+    "dotnet": "dotnet",
+    "java": "java"
+}
+
+class ShardPlanner:
+    def __init__(self, workers: int):
+        self.workers = workers
+        # (family, unit) -> test name -> observed durations (seconds, None if unknown)
+        self.samples: Dict[Tuple[str, str], Dict[str, List[Optional[float]]]] = {}
+
+    def add_test(self, framework: str, name: str, file: Optional[str], duration: Optional[float]):
+        """Record one observation of a test."""
+        family = SELECTOR_FAMILIES.get(framework, "other")
+        if family in ("jest", "vitest") and file:
+            unit = file
+        elif family == "go":
+            # Subtests run as part of their top-level test
+            if "/" in name:
+                return
+            unit = name
+        else:
+            unit = name
+        self.samples.setdefault((family, unit), {}).setdefault(name, []).append(duration)
+
+    def add_results(self, results: Dict[str, Any]):
+        """Record the tests of a parse_test_output.py result.
+
+        Tests are grouped by their own framework (a "mixed" run holds
+        several); results written before tests carried one use the run's.
+        """
+        for test in results["tests"]:
+            self.add_test(
+                test.get("framework") or results["framework"], test["name"], test.get("file"),
+                duration_to_seconds(test.get("duration"))
+            )
+
+    def unit_durations(self) -> Dict[Tuple[str, str], float]:
+        """Estimated duration per unit: the sum of its tests' mean durations.
+
+        Tests never timed count as the mean of the timed ones.
+        """
+        means: Dict[Tuple[str, str], List[Optional[float]]] = {}
+        for key, tests in self.samples.items():
+            means[key] = []
+            for durations in tests.values():
+                known = [duration for duration in durations if duration is not None]
+                means[key].append(sum(known) / len(known) if known else None)
+
+        timed = [mean for values in means.values() for mean in values if mean is not None]
+        fallback = sum(timed) / len(timed) if timed else 1.0
+        return {
+            key: sum(mean if mean is not None else fallback for mean in values)
+            for key, values in means.items()
+        }
+
+    def plan(self) -> Dict[str, Any]:
+        """Assign units to shards with LPT and simulate the resulting makespan."""
+        durations = self.unit_durations()
+        # Longest first; ties broken by name so plans are reproducible
+        units = sorted(durations.items(), key=lambda item: (-item[1], item[0]))
+
+        shards = [{"index": i, "predicted_duration": 0.0, "units": []} for i in range(self.workers)]
+        heap = [(0.0, i) for i in range(self.workers)]
+        for (family, unit), duration in units:
+            load, index = heapq.heappop(heap)
+            shards[index]["units"].append((family, unit))
+            shards[index]["predicted_duration"] = load + duration
+            heapq.heappush(heap, (load + duration, index))
+
+        total = sum(durations.values())
+        makespan = max(shard["predicted_duration"] for shard in shards) if shards else 0.0
+        count_makespan = self._count_based_makespan(durations)
+
+        return {
+            "workers": self.workers,
+            "shards": [
+                {
+                    "index": shard["index"],
+                    "predicted_duration": round(shard["predicted_duration"], 3),
+                    "selectors": _selectors(shard["units"])
+                }
+                for shard in shards
+            ],
+            "report": {
+                "units": len(durations),
+                "total_duration": round(total, 3),
+                "ideal_makespan": round(total / self.workers, 3) if self.workers else 0.0,
+                "makespan": round(makespan, 3),
+                "count_based_makespan": round(count_makespan, 3),
+                "predicted_gain": round(count_makespan - makespan, 3),
+                "speedup_vs_count_based": round(count_makespan / makespan, 2) if makespan else None
+            }
+        }
+
+    def _count_based_makespan(self, durations: Dict[Tuple[str, str], float]) -> float:
+        """Makespan when units are split into equal-count contiguous groups (by name)."""
+        ordered = [durations[key] for key in sorted(durations)]
+        if not ordered:
+            return 0.0
+        per_shard = -(-len(ordered) // self.workers)
+        return max(
+            sum(ordered[start:start + per_shard])
+            for start in range(0, len(ordered), per_shard)
+        )
+
+def _selectors(units: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Per-framework test selection for one shard."""
+    by_family: Dict[str, List[str]] = {}
+    for family, unit in units:
+        by_family.setdefault(family, []).append(unit)
+
+    selectors = {}
+    for family, names in sorted(by_family.items()):
+        names.sort()
+        if family == "pytest":
+            command = "pytest " + " ".join(names)
+        elif family in ("jest", "vitest"):
+            command = ("npx jest " if family == "jest" else "npx vitest run ") + " ".join(names)
+        elif family == "go":
+            command = "go test ./... -run '^(" + "|".join(names) + ")$'"
+        elif family == "cargo":
+            command = "cargo test -- --exact " + " ".join(names)
+        elif family == "dotnet":
+            command = 'dotnet test --filter "' + "|".join(f"FullyQualifiedName={name}" for name in names) + '"'
+        elif family == "java":
+            command = "mvn test -Dtest=" + ",".join("#".join(name.rsplit(".", 1)) for name in names)
+        else:
+            command = None
+        selectors[family] = {"tests": names, "command": command}
+    return selectors
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan duration-balanced test shards")
+    parser.add_argument("results", nargs="*", help="parse_test_output.py JSON result files")
+    parser.add_argument("--workers", type=int, required=True, help="Number of CI workers")
+    parser.add_argument("--history", help="Test history database (test_history.py)")
+    parser.add_argument("--runs", type=int, default=20,
+                        help="History runs used for durations (default: 20)")
+
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        print("Error: --workers must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    if not args.results and not args.history:
+        print("Error: give result files and/or --history", file=sys.stderr)
+        sys.exit(1)
+
+    planner = ShardPlanner(args.workers)
+
+    if args.history:
+        from test_history import TestHistory
+        history = TestHistory(args.history)
+        for framework, name, file, duration in history.durations(args.runs):
+            planner.add_test(framework or "unknown", name, file, duration)
+        history.close()
+
+    for results_file in args.results:
+        results_path = Path(results_file)
+        if not results_path.exists():
+            print(f"Error: File not found: {results_path}", file=sys.stderr)
+            sys.exit(1)
+        planner.add_results(json.loads(results_path.read_text(encoding='utf-8')))
+
+    # Output as JSON
+    print(json.dumps(planner.plan(), indent=2))
+
+if __name__ == "__main__":
+    main()
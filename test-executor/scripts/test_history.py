@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Test History Store
+
+Append-only SQLite history of parsed test results, keyed by test name and
+commit. Fed by parse_test_output.py (--history) or by importing its JSON
+output, and queried for slow, regressing and flaky tests. Runs whose commit
+is not known are stored without one and left out of flaky detection.
+
+Usage:
+    python parse_test_output.py --history .test-history.db test-output.txt
+    python test_history.py .test-history.db import results.json --commit abc123
+    python test_history.py .test-history.db slowest -n 20
+    python test_history.py .test-history.db regressions --runs 10 --threshold 1.2
+    python test_history.py .test-history.db flaky
+
+Output: JSON query results
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import subprocess
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+from pathlib import Path
+
+from parse_test_output import duration_to_seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_sha TEXT,
+    recorded_at REAL NOT NULL,
+    framework TEXT,
+    total INTEGER,
+    passed INTEGER,
+    failed INTEGER,
+    skipped INTEGER,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL,
+    file TEXT,
+    framework TEXT
+);
+CREATE INDEX IF NOT EXISTS results_by_name ON results(name, run_id);
+CREATE INDEX IF NOT EXISTS results_by_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS runs_by_commit ON runs(commit_sha);
+"""
+
+# Rows inserted per executemany() call while recording
+BATCH_SIZE = 1000
+
+def current_commit() -> Optional[str]:
+    """Return the HEAD commit of the current repository, or None (with a warning)."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        print("Warning: Could not determine the current commit, recording the run without one "
+              "(pass --commit)", file=sys.stderr)
+        return None
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+class TestHistory:
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+        # Databases created before per-test files and frameworks were recorded
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(results)")]
+        for column in ("file", "framework"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {column} TEXT")
+        # Databases that required a commit and stored "unknown" when there was none
+        if any(row[1] == "commit_sha" and row[3] for row in self.conn.execute("PRAGMA table_info(runs)")):
+            self._allow_missing_commits()
+
+    def _allow_missing_commits(self):
+        # Copied into a new table that replaces runs, so results keeps referencing runs
+        runs_table = SCHEMA.split("CREATE TABLE IF NOT EXISTS results")[0]
+        columns = "id, commit_sha, recorded_at, framework, total, passed, failed, skipped, duration"
+        with self.conn:
+            self.conn.execute(runs_table.replace("IF NOT EXISTS runs", "runs_nullable_commit"))
+            self.conn.execute(f"INSERT INTO runs_nullable_commit ({columns}) SELECT {columns} FROM runs")
+            self.conn.execute("UPDATE runs_nullable_commit SET commit_sha = NULL WHERE commit_sha = 'unknown'")
+            self.conn.execute("DROP TABLE runs")
+            self.conn.execute("ALTER TABLE runs_nullable_commit RENAME TO runs")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS runs_by_commit ON runs(commit_sha)")
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, tests: Iterable[Dict[str, Any]], results: Dict[str, Any],
+               commit: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Store tests while passing them through.
+
+        results is the parser's result dict; its framework and summary are
+        stored once the tests are exhausted.
+        """
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (commit_sha, recorded_at) VALUES (?, ?)",
+                (commit, time.time())
+            ).lastrowid
+
+        batch = []
+        for test in tests:
+            batch.append((
+                run_id, test["name"], test["status"], duration_to_seconds(test.get("duration")), test.get("file"),
+                test.get("framework")
+            ))
+            if len(batch) >= BATCH_SIZE:
+                self._insert(batch)
+                batch = []
+            yield test
+        self._insert(batch)
+
+        summary = results["summary"]
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET framework = ?, total = ?, passed = ?, failed = ?, skipped = ?, duration = ? "
+                "WHERE id = ?",
+                (results["framework"], summary["total"], summary["passed"], summary["failed"],
+                 summary["skipped"], duration_to_seconds(summary["duration"]), run_id)
+            )
+
+    def _insert(self, rows: List[tuple]):
+        if rows:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO results (run_id, name, status, duration, file, framework) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    def durations(self, runs: int = 20) -> List[tuple]:
+        """Mean duration of each test over the last runs, as (framework, name, file, seconds).
+
+        The framework is the test's own (a mixed run holds several); rows
+        recorded before it was stored fall back to the run's.
+        """
+        return self.conn.execute(
+            """
+            SELECT COALESCE(results.framework, runs.framework) AS test_framework, results.name, results.file,
+                   AVG(results.duration)
+            FROM results JOIN runs ON runs.id = results.run_id
+            WHERE results.run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+            GROUP BY test_framework, results.name, results.file
+            ORDER BY test_framework, results.name
+            """,
+            (runs,)
+        ).fetchall()
+
+    def slowest(self, limit: int = 20, runs: int = 20) -> List[Dict[str, Any]]:
+        """Tests with the highest mean duration over the last runs."""
+        rows = self.conn.execute(
+            """
+            SELECT name, AVG(duration), MAX(duration), COUNT(*)
+            FROM results
+            WHERE duration IS NOT NULL
+              AND run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+            GROUP BY name
+            ORDER BY AVG(duration) DESC
+            LIMIT ?
+            """,
+            (runs, limit)
+        ).fetchall()
+        return [
+            {"name": name, "mean": round(mean, 6), "max": round(longest, 6), "samples": samples}
+            for name, mean, longest, samples in rows
+        ]
+
+    def regressions(self, runs: int = 10, threshold: float = 1.2,
+                    min_samples: int = 3) -> List[Dict[str, Any]]:
+        """Tests whose p95 over their last runs exceeds threshold x the p95 of the runs before."""
+        rows = self.conn.execute(
+            """
+            SELECT name, duration FROM (
+                SELECT name, duration,
+                       ROW_NUMBER() OVER (PARTITION BY name ORDER BY run_id DESC) AS age
+                FROM results
+                WHERE duration IS NOT NULL
+            )
+            WHERE age <= ?
+            ORDER BY name, age
+            """,
+            (2 * runs,)
+        ).fetchall()
+
+        regressed = []
+        for name, durations in _group_by_name(rows):
+            recent, baseline = durations[:runs], durations[runs:]
+            if len(recent) < min_samples or len(baseline) < min_samples:
+                continue
+            recent_p95 = percentile(recent, 0.95)
+            baseline_p95 = percentile(baseline, 0.95)
+            if baseline_p95 > 0 and recent_p95 > baseline_p95 * threshold:
+                regressed.append({
+                    "name": name,
+                    "recent_p95": round(recent_p95, 6),
+                    "baseline_p95": round(baseline_p95, 6),
+                    "ratio": round(recent_p95 / baseline_p95, 2)
+                })
+
+        regressed.sort(key=lambda item: item["ratio"], reverse=True)
+        return regressed
+
+    def flaky(self) -> List[Dict[str, Any]]:
+        """Tests that both passed and failed on the same commit (runs without a commit are skipped)."""
+        rows = self.conn.execute(
+            """
+            SELECT results.name, runs.commit_sha,
+                   SUM(results.status = 'passed'), SUM(results.status = 'failed')
+            FROM results JOIN runs ON runs.id = results.run_id
+            WHERE results.status IN ('passed', 'failed') AND runs.commit_sha IS NOT NULL
+            GROUP BY results.name, runs.commit_sha
+            HAVING COUNT(DISTINCT results.status) > 1
+            ORDER BY results.name
+            """
+        ).fetchall()
+
+        flaky: Dict[str, Dict[str, Any]] = {}
+        for name, commit, passed, failed in rows:
+            entry = flaky.setdefault(name, {"name": name, "commits": [], "passed": 0, "failed": 0})
+            entry["commits"].append(commit)
+            entry["passed"] += passed
+            entry["failed"] += failed
+        return sorted(flaky.values(), key=lambda item: len(item["commits"]), reverse=True)
+
+def _group_by_name(rows: List[tuple]) -> Iterator[tuple]:
+    """Group (name, value) rows sorted by name into (name, [values])."""
+    name, values = None, []
+    for row_name, value in rows:
+        if row_name != name:
+            if values:
+                yield name, values
+            name, values = row_name, []
+        values.append(value)
+    if values:
+        yield name, values
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the test history store")
+    parser.add_argument("db", help="Path to the history database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = commands.add_parser("import", help="Record a parse_test_output.py JSON result")
+    import_cmd.add_argument("results", help="JSON file produced by parse_test_output.py")
+    import_cmd.add_argument("--commit", help="Commit SHA (default: current HEAD)")
+
+    slowest_cmd = commands.add_parser("slowest", help="Slowest tests over the last runs")
+    slowest_cmd.add_argument("-n", type=int, default=20, help="Number of tests (default: 20)")
+    slowest_cmd.add_argument("--runs", type=int, default=20, help="Runs to consider (default: 20)")
+
+    regressions_cmd = commands.add_parser("regressions", help="Tests whose p95 duration regressed")
+    regressions_cmd.add_argument("--runs", type=int, default=10,
+                                 help="Compare each test's last N runs to the N before (default: 10)")
+    regressions_cmd.add_argument("--threshold", type=float, default=1.2,
+                                 help="p95 ratio counted as a regression (default: 1.2)")
+
+    commands.add_parser("flaky", help="Tests that passed and failed on the same commit")
+
+    args = parser.parse_args()
+
+    history = TestHistory(args.db)
+    try:
+        if args.command == "import":
+            results_path = Path(args.results)
+            if not results_path.exists():
+                print(f"Error: File not found: {results_path}", file=sys.stderr)
+                sys.exit(1)
+            results = json.loads(results_path.read_text(encoding='utf-8'))
+            recorded = sum(1 for _ in history.record(results["tests"], results, args.commit or current_commit()))
+            output: Any = {"recorded": recorded}
+        elif args.command == "slowest":
+            output = history.slowest(args.n, args.runs)
+        elif args.command == "regressions":
+            output = history.regressions(args.runs, args.threshold)
+        else:
+            output = history.flaky()
+    finally:
+        history.close()
+
+    # Output as JSON
+    print(json.dumps(output, indent=2))
+
+if __name__ == "__main__":
+    main()
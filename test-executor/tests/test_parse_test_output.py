@@ -0,0 +1,78 @@
+"""Tests for scripts/parse_test_output.py (run with: python -m unittest discover test-executor/tests)."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from parse_test_output import TestOutputParser  # noqa: E402
+
+# Default reporter of a Vitest 1.6 run with one failing test
+VITEST_LOG = """
+ RUN  v1.6.0 /home/dev/shop
+
+ ✓ src/cart.test.ts (2 tests) 3ms
+ ❯ src/price.test.ts (2 tests | 1 failed) 7ms
+   ❯ src/price.test.ts > price > applies the discount
+     → expected 90 to be 80
+
+⎯⎯⎯⎯⎯⎯⎯ Failed Tests 1 ⎯⎯⎯⎯⎯⎯⎯
+
+ FAIL  src/price.test.ts > price > applies the discount
+AssertionError: expected 90 to be 80 // Object.is equality
+
+- Expected
++ Received
+
+- 80
++ 90
+
+ ❯ src/price.test.ts:9:30
+      7|   it('rounds to cents', () => expect(round(1.005)).toBe(1.01))
+      8|   it('applies the discount', () => {
+      9|     expect(price(100, 0.2)).toBe(80)
+       |                              ^
+     10|   })
+     11| })
+
+⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯[1/1]⎯
+
+ Test Files  1 failed | 1 passed (2)
+      Tests  1 failed | 3 passed (4)
+   Start at  10:15:42
+   Duration  412ms (transform 45ms, setup 0ms, collect 30ms, tests 10ms, environment 0ms, prepare 120ms)
+"""
+
+JEST_LOG = """
+FAIL  src/price.test.ts (1.2 s)
+  ✓ rounds to cents (3 ms)
+  ✗ applies the discount (5 ms)
+
+Test Suites: 1 failed, 1 total
+Tests:       1 failed, 1 passed, 2 total
+Time:        1.5 s
+"""
+
+class SectionTest(unittest.TestCase):
+    def test_vitest_failure_headers_are_not_jest_sections(self):
+        results = TestOutputParser(VITEST_LOG).parse()
+
+        self.assertEqual(results["framework"], "vitest")
+        self.assertNotIn("frameworks", results)
+        self.assertEqual(results["summary"], {
+            "total": 4, "passed": 3, "failed": 1, "skipped": 0, "duration": "412ms"
+        })
+
+    def test_jest_failure_header_opens_a_jest_section(self):
+        results = TestOutputParser(JEST_LOG).parse()
+
+        self.assertEqual(results["framework"], "jest")
+        self.assertEqual(results["summary"], {
+            "total": 2, "passed": 1, "failed": 1, "skipped": 0, "duration": "1.5s"
+        })
+        self.assertEqual([(test["name"], test["file"]) for test in results["tests"]],
+                         [("rounds to cents", "src/price.test.ts"), ("applies the discount", "src/price.test.ts")])
+
+if __name__ == "__main__":
+    unittest.main()
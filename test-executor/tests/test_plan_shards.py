@@ -0,0 +1,61 @@
+"""Tests for scripts/plan_shards.py (run with: python -m unittest discover test-executor/tests)."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from parse_test_output import TestOutputParser  # noqa: E402
+from plan_shards import ShardPlanner  # noqa: E402
+
+# pytest --junitxml report (pytest 8)
+PYTEST_JUNIT = """<?xml version="1.0" encoding="utf-8"?><testsuites name="pytest tests">\
+<testsuite name="pytest" errors="0" failures="1" skipped="0" tests="4" time="4.080" hostname="ci">
+<testcase classname="tests.test_cart" name="test_add" time="3.0" />
+<testcase classname="tests.test_cart.TestTotals" name="test_sum[1.5]" time="0.5" />
+<testcase classname="tests.test_cart.TestTotals" name="test_sum[2]" time="0.5" />
+<testcase classname="tests.test_cart" name="test_fail" time="0.08"><failure message="assert 0">assert 0</failure></testcase>
+</testsuite></testsuites>
+"""
+
+# Maven Surefire report
+SUREFIRE_JUNIT = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuite xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" \
+xsi:noNamespaceSchemaLocation="https://maven.apache.org/surefire/maven-surefire-plugin/xsd/surefire-test-report-3.0.xsd" \
+version="3.0" name="com.example.CartTest" time="2.5" tests="2" errors="0" skipped="0" failures="0">
+  <properties>
+    <property name="java.version" value="17.0.9"/>
+  </properties>
+  <testcase name="addsItems" classname="com.example.CartTest" time="2.0"/>
+  <testcase name="emptiesCart" classname="com.example.CartTest" time="0.5"/>
+</testsuite>
+"""
+
+class JUnitShardTest(unittest.TestCase):
+    def plan(self, report: str, workers: int = 2):
+        planner = ShardPlanner(workers)
+        planner.add_results(TestOutputParser(report).parse())
+        return planner.plan()
+
+    def test_pytest_report_shards_into_node_ids(self):
+        plan = self.plan(PYTEST_JUNIT)
+
+        selectors = [shard["selectors"] for shard in plan["shards"]]
+        self.assertEqual([list(selector) for selector in selectors], [["pytest"], ["pytest"]])
+        self.assertEqual(selectors[0]["pytest"]["command"], "pytest tests/test_cart.py::test_add")
+        self.assertEqual(selectors[1]["pytest"]["tests"], [
+            "tests/test_cart.py::TestTotals::test_sum[1.5]",
+            "tests/test_cart.py::TestTotals::test_sum[2]",
+            "tests/test_cart.py::test_fail"
+        ])
+        self.assertEqual(plan["report"]["makespan"], 3.0)
+
+    def test_surefire_report_shards_into_maven_selectors(self):
+        plan = self.plan(SUREFIRE_JUNIT, workers=1)
+
+        self.assertEqual(plan["shards"][0]["selectors"]["java"]["command"],
+                         "mvn test -Dtest=com.example.CartTest#addsItems,com.example.CartTest#emptiesCart")
+
+if __name__ == "__main__":
+    unittest.main()
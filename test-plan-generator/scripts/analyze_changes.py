@@ -9,21 +9,168 @@ Usage:
     python analyze_changes.py [base-branch]
     python analyze_changes.py main
     python analyze_changes.py develop
+    python analyze_changes.py main --impact
+    python analyze_changes.py main --hunks --impact
+    python analyze_changes.py --batch ranges.txt --jobs 8
 
-Output: JSON with test recommendations
+Options:
+    --impact        Also list the test files that transitively import the
+                    changed files (Python, TypeScript/JavaScript, Go, C#)
+    --cache PATH    Dependency index used by --impact
+                    (default: <git-dir>/analyze_changes/dependency-index.db)
+    --hunks         Stream the patch (git diff -U0) and report changed line
+                    ranges and touched symbols per file; files whose changes
+                    are only comments or blank lines do not drive
+                    recommendations or impacted tests
+    --batch FILE    Analyze many ranges (one "base...head" per line, "-" for
+                    stdin) through long-lived git processes; prints one JSON
+                    object per range (JSON Lines) as each completes.
+                    "base...head" diffs head against the merge base,
+                    "base..head" against base itself, and a lone "base"
+                    means "base...HEAD"
+    --jobs N        Worker processes for --batch (default: 1)
+
+Output: JSON with test recommendations and per-file category and tags
+        (JSON Lines with --batch)
 """
 
 import sys
 import subprocess
 import json
 import re
-from typing import Dict, List, Any
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Set, Tuple, Iterator
 from pathlib import Path
 
+from dependency_graph import DependencyGraph, GitBlobReader, LANGUAGES, MAX_BLOB_BYTES, extract_symbols
+from diff_hunks import DiffTreePipe, iter_file_hunks, stream_diff, touched_symbols
+
+# File categories, in precedence order: a file counts toward the first match
+CATEGORY_PATTERNS = {
+    "test": [
+        r'\.test\.',
+        r'\.spec\.',
+        r'Test\.cs$',
+        r'Tests\.cs$',
+        r'^tests?/',
+        r'/__tests__/',
+        r'/test_',
+        r'_test\.py$',
+        r'_test\.go$'
+    ],
+    "backend": [
+        r'\.cs$',  # C#
+        r'backend/',
+        r'server/',
+        r'api/',
+        r'src/.*Controller',
+        r'src/.*Service',
+        r'\.go$',  # Go
+        r'main\.py$',  # Python
+        r'app\.py$',
+        r'__init__\.py$'
+    ],
+    "frontend": [
+        r'\.tsx?$',  # TypeScript/React
+        r'\.jsx?$',  # JavaScript/React
+        r'\.vue$',  # Vue
+        r'\.svelte$',  # Svelte
+        r'components/',
+        r'pages/',
+        r'views/',
+        r'src/.*\.(css|scss|less)$'
+    ],
+    "database": [
+        r'migrations?/',
+        r'\.sql$',
+        r'schema',
+        r'Entities/',
+        r'Models/',
+        r'Domain/'
+    ]
+}
+
+# Signals used by the recommendations (any changed file matching)
+SIGNAL_PATTERNS = {
+    "user_facing": [
+        r'pages/',
+        r'components/',
+        r'views/',
+        r'Controller\.cs$',
+        r'routes'
+    ],
+    "api": [
+        r'Controller',
+        r'api/',
+        r'routes',
+        r'endpoints'
+    ],
+    "complex_logic": [
+        r'Service',
+        r'Validator',
+        r'Helper',
+        r'Utils',
+        r'Algorithm'
+    ],
+    "external_integration": [
+        r'Integration',
+        r'Client',
+        r'Api',
+        r'External'
+    ],
+    "performance": [
+        r'Query',
+        r'Database',
+        r'Cache',
+        r'Optimize',
+        r'Performance'
+    ]
+}
+
+class PathClassifier:
+    """Assigns all tags of a path in a single pass over the tag table.
+
+    Each tag's patterns are precompiled into one alternation and searched in
+    the lowercased path (cheaper than re.IGNORECASE), so a path costs one
+    regex search per tag instead of one per pattern. Patterns are lowercased
+    too, so they must not rely on case-sensitive escapes such as \\S or \\W.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        self.searches = [
+            (tag, re.compile("|".join(f"(?:{pattern.lower()})" for pattern in tag_patterns)).search)
+            for tag, tag_patterns in patterns.items()
+        ]
+
+    def classify(self, path: str) -> List[str]:
+        """Tags matching the path, in pattern table order."""
+        lowered = path.lower()
+        return [tag for tag, search in self.searches if search(lowered)]
+
+CLASSIFIER = PathClassifier({**CATEGORY_PATTERNS, **SIGNAL_PATTERNS})
+
 class ChangeAnalyzer:
-    def __init__(self, base_branch: str = "main"):
+    def __init__(self, base_branch: str = "main", impact: bool = False, cache_path: Optional[str] = None,
+                 hunks: bool = False, head: str = "HEAD", session: Optional["BatchSession"] = None,
+                 trees: Optional[Tuple[str, str]] = None, graph: Optional[DependencyGraph] = None):
         self.base_branch = base_branch
+        self.impact = impact
+        self.cache_path = cache_path
+        self.hunks = hunks
+        self.head = head
+        # Batch mode: shared git pipes, and the (merge base, head) trees to diff
+        self.session = session
+        self.trees = trees
+        # Shared dependency index (kept open by the caller)
+        self.graph = graph
         self.changed_files = []
+        # File -> changed line ranges and touched symbols (--hunks)
+        self.file_hunks: Dict[str, Dict[str, Any]] = {}
+        # Files whose changes are only comments or blank lines (--hunks)
+        self.trivial_files: Set[str] = set()
+        # Recommendation signals seen in any changed file
+        self.signals: Set[str] = set()
         self.analysis = {
             "summary": {
                 "total_files": 0,
@@ -39,22 +186,33 @@ class ChangeAnalyzer:
                 "integration_tests": [],
                 "performance_tests": []
             },
-            "changed_files": []
+            "changed_files": [],
+            "files": {}
         }
 
     def analyze(self) -> Dict[str, Any]:
         """Analyze changes and generate test recommendations."""
         self._get_changed_files()
+        if self.hunks:
+            self._analyze_hunks()
         self._categorize_files()
         self._generate_recommendations()
+        if self.impact:
+            self._find_impacted_tests()
         return self.analysis
 
     def _get_changed_files(self):
         """Get list of changed files from git diff."""
+        if self.session:
+            self.changed_files = self.session.names.changed_files(*self.trees)
+            self.analysis["summary"]["total_files"] = len(self.changed_files)
+            self.analysis["changed_files"] = self.changed_files
+            return
+
         try:
             # Get changed files
             result = subprocess.run(
-                ["git", "diff", f"{self.base_branch}...HEAD", "--name-only"],
+                ["git", "diff", f"{self.base_branch}...{self.head}", "--name-only"],
                 capture_output=True,
                 text=True,
                 check=True
@@ -66,76 +224,80 @@ class ChangeAnalyzer:
             print(f"Error getting changed files: {e}", file=sys.stderr)
             sys.exit(1)
 
+    def _analyze_hunks(self):
+        """Stream the patch and record changed line ranges and touched symbols per file."""
+        if self.session:
+            reader = self.session.reader
+            patch = iter_file_hunks(self.session.patches.lines(*self.trees))
+        else:
+            reader = GitBlobReader()
+            patch = stream_diff(f"{self.base_branch}...{self.head}")
+        try:
+            for hunks in patch:
+                if hunks.path is None:
+                    continue
+                symbols = None
+                if hunks.ranges and Path(hunks.path).suffix in LANGUAGES:
+                    # Symbols come from the file at HEAD, one file in memory at a time
+                    content = reader.read(f"{self.head}:{hunks.path}")
+                    if content is not None and len(content) <= MAX_BLOB_BYTES:
+                        symbols = extract_symbols(hunks.path, content.decode('utf-8', errors='replace'))
+                self.file_hunks[hunks.path] = {
+                    "ranges": hunks.ranges,
+                    "added_lines": hunks.added,
+                    "removed_lines": hunks.removed,
+                    "trivial": hunks.trivial,
+                    "symbols": touched_symbols(symbols, hunks.ranges) if symbols is not None else []
+                }
+                if hunks.trivial:
+                    self.trivial_files.add(hunks.path)
+        except subprocess.CalledProcessError as e:
+            if self.session:
+                # Batch mode: reported as the error of this range only
+                raise
+            print(f"Error reading diff: {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if not self.session:
+                reader.close()
+
+        self.analysis["summary"]["trivial_files"] = len(self.trivial_files)
+
+    def _find_impacted_tests(self):
+        """Find test files that transitively import the changed files."""
+        graph = self.graph or open_dependency_index(self.cache_path)
+        try:
+            graph.tree = self.head
+            graph.build()
+            # Only tests that still exist at the head are in the index
+            changed = [f for f in self.changed_files if f not in self.trivial_files]
+            categories = graph.categories(graph.impacted(changed))
+            impacted = sorted(f for f, category in categories.items() if category == "test")
+            self.analysis["index"] = {"files": graph.file_count(), "updated": graph.updated}
+        except subprocess.CalledProcessError as e:
+            print(f"Error indexing repository: {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if not self.graph:
+                graph.close()
+
+        self.analysis["summary"]["impacted_test_files"] = len(impacted)
+        self.analysis["impacted_tests"] = impacted
+
     def _categorize_files(self):
-        """Categorize files by type."""
+        """Categorize files by type and collect recommendation signals in one pass."""
+        files = self.analysis["files"]
         for file_path in self.changed_files:
-            path = Path(file_path)
-
-            # Categorize
-            if self._is_test_file(file_path):
-                self.analysis["summary"]["test_files"] += 1
-            elif self._is_backend_file(file_path):
-                self.analysis["summary"]["backend_files"] += 1
-            elif self._is_frontend_file(file_path):
-                self.analysis["summary"]["frontend_files"] += 1
-            elif self._is_database_file(file_path):
-                self.analysis["summary"]["database_files"] += 1
-
-    def _is_test_file(self, path: str) -> bool:
-        """Check if file is a test file."""
-        test_patterns = [
-            r'\.test\.',
-            r'\.spec\.',
-            r'Test\.cs$',
-            r'Tests\.cs$',
-            r'^tests?/',
-            r'/__tests__/',
-            r'/test_',
-            r'_test\.py$'
-        ]
-        return any(re.search(pattern, path, re.IGNORECASE) for pattern in test_patterns)
-
-    def _is_backend_file(self, path: str) -> bool:
-        """Check if file is a backend file."""
-        backend_patterns = [
-            r'\.cs$',  # C#
-            r'backend/',
-            r'server/',
-            r'api/',
-            r'src/.*Controller',
-            r'src/.*Service',
-            r'\.go$',  # Go
-            r'main\.py$',  # Python
-            r'app\.py$',
-            r'__init__\.py$'
-        ]
-        return any(re.search(pattern, path, re.IGNORECASE) for pattern in backend_patterns)
-
-    def _is_frontend_file(self, path: str) -> bool:
-        """Check if file is a frontend file."""
-        frontend_patterns = [
-            r'\.tsx?$',  # TypeScript/React
-            r'\.jsx?$',  # JavaScript/React
-            r'\.vue$',  # Vue
-            r'\.svelte$',  # Svelte
-            r'components/',
-            r'pages/',
-            r'views/',
-            r'src/.*\.(css|scss|less)$'
-        ]
-        return any(re.search(pattern, path, re.IGNORECASE) for pattern in frontend_patterns)
-
-    def _is_database_file(self, path: str) -> bool:
-        """Check if file is a database-related file."""
-        db_patterns = [
-            r'migrations?/',
-            r'\.sql$',
-            r'schema',
-            r'Entities/',
-            r'Models/',
-            r'Domain/'
-        ]
-        return any(re.search(pattern, path, re.IGNORECASE) for pattern in db_patterns)
+            tags = CLASSIFIER.classify(file_path)
+            category = _category(tags)
+            files[file_path] = {"category": category, "tags": tags}
+            if file_path in self.file_hunks:
+                files[file_path].update(self.file_hunks[file_path])
+            if file_path in self.trivial_files:
+                continue
+            if category != "other":
+                self.analysis["summary"][f"{category}_files"] += 1
+            self.signals.update(tags)
 
     def _generate_recommendations(self):
         """Generate test recommendations based on changes."""
@@ -193,76 +355,199 @@ class ChangeAnalyzer:
 
     def _has_user_facing_changes(self) -> bool:
         """Check if changes are user-facing."""
-        user_facing_patterns = [
-            r'pages/',
-            r'components/',
-            r'views/',
-            r'Controller\.cs$',
-            r'routes'
-        ]
-        return any(
-            any(re.search(pattern, f, re.IGNORECASE) for pattern in user_facing_patterns)
-            for f in self.changed_files
-        )
+        return "user_facing" in self.signals
 
     def _has_api_changes(self) -> bool:
         """Check if API endpoints were added/modified."""
-        api_patterns = [
-            r'Controller',
-            r'api/',
-            r'routes',
-            r'endpoints'
-        ]
-        return any(
-            any(re.search(pattern, f, re.IGNORECASE) for pattern in api_patterns)
-            for f in self.changed_files
-        )
+        return "api" in self.signals
 
     def _has_complex_logic(self) -> bool:
         """Check if complex business logic was added."""
-        logic_patterns = [
-            r'Service',
-            r'Validator',
-            r'Helper',
-            r'Utils',
-            r'Algorithm'
-        ]
-        return any(
-            any(re.search(pattern, f, re.IGNORECASE) for pattern in logic_patterns)
-            for f in self.changed_files
-        )
+        return "complex_logic" in self.signals
 
     def _has_external_integrations(self) -> bool:
         """Check if external service integrations were added."""
-        integration_patterns = [
-            r'Integration',
-            r'Client',
-            r'Api',
-            r'External'
-        ]
-        return any(
-            any(re.search(pattern, f, re.IGNORECASE) for pattern in integration_patterns)
-            for f in self.changed_files
-        )
+        return "external_integration" in self.signals
 
     def _is_performance_critical(self) -> bool:
         """Check if changes are performance-critical."""
-        perf_patterns = [
-            r'Query',
-            r'Database',
-            r'Cache',
-            r'Optimize',
-            r'Performance'
-        ]
-        return any(
-            any(re.search(pattern, f, re.IGNORECASE) for pattern in perf_patterns)
-            for f in self.changed_files
+        return "performance" in self.signals
+
+class BatchSession:
+    """Long-lived git processes shared by the ranges analyzed in one process."""
+
+    def __init__(self, hunks: bool = False):
+        self.names = DiffTreePipe()
+        self.patches = DiffTreePipe(patch=True) if hunks else None
+        self.reader = GitBlobReader()
+
+    def close(self):
+        self.names.close()
+        if self.patches:
+            self.patches.close()
+        self.reader.close()
+
+def open_dependency_index(cache_path: Optional[str] = None) -> DependencyGraph:
+    """Dependency index of the current repository (default: under its git directory)."""
+    try:
+        root = _git("rev-parse", "--show-toplevel")
+        cache_path = cache_path or str(
+            Path(root, _git("rev-parse", "--git-common-dir"), "analyze_changes", "dependency-index.db")
         )
+    except subprocess.CalledProcessError as e:
+        print(f"Error locating repository: {e}", file=sys.stderr)
+        sys.exit(1)
+    return DependencyGraph(root, cache_path, categorize=categorize_path)
+
+def resolve_ranges(specs: List[str]) -> List[Dict[str, Any]]:
+    """Resolve "base...head" and "base..head" specs to base and head commits and trees.
+
+    The base of "A...B" is the merge base of A and B, the base of "A..B" is
+    A itself (like git diff). Uses one git rev-parse for all ranges (and one
+    for their trees); a range that does not resolve gets an "error" instead.
+    """
+    ranges = [{"range": spec if ".." in spec else f"{spec}...HEAD"} for spec in specs]
+    try:
+        output = _git("rev-parse", *(item["range"] for item in ranges)).split("\n")
+    except subprocess.CalledProcessError:
+        # Resolve one by one to tell which ranges are bad
+        if len(ranges) == 1:
+            ranges[0]["error"] = f"cannot resolve {ranges[0]['range']}"
+            return ranges
+        return [resolved for spec in specs for resolved in resolve_ranges([spec])]
+
+    # Each "A...B" prints B, A, then ^<merge base> lines; each "A..B" prints B, ^A
+    position = 0
+    for item in ranges:
+        item["head"] = output[position]
+        position += 2 if "..." in item["range"] else 1
+        bases = []
+        while position < len(output) and output[position].startswith("^"):
+            bases.append(output[position][1:])
+            position += 1
+        if bases:
+            item["base"] = bases[0]
+        else:
+            item["error"] = f"no merge base for {item['range']}"
+
+    resolved = [item for item in ranges if "error" not in item]
+    if resolved:
+        trees = _git(
+            "rev-parse", *(f"{commit}^{{tree}}" for item in resolved for commit in (item["base"], item["head"]))
+        ).split("\n")
+        for i, item in enumerate(resolved):
+            item["trees"] = (trees[2 * i], trees[2 * i + 1])
+    return ranges
+
+def analyze_batch(ranges: List[Dict[str, Any]], jobs: int = 1, hunks: bool = False,
+                  impact: bool = False, cache_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Analyze resolved ranges, yielding each result as it completes."""
+    graph = open_dependency_index(cache_path) if impact else None
+    try:
+        for result in _iter_batch_results(ranges, jobs, hunks):
+            if graph and "error" not in result:
+                _add_impacted_tests(result, graph)
+            yield result
+    finally:
+        if graph:
+            graph.close()
+
+def _iter_batch_results(ranges: List[Dict[str, Any]], jobs: int, hunks: bool) -> Iterator[Dict[str, Any]]:
+    for item in ranges:
+        if "error" in item:
+            yield {"range": item["range"], "error": item["error"]}
+    pending = [item for item in ranges if "error" not in item]
+
+    if jobs <= 1:
+        session = BatchSession(hunks)
+        try:
+            for item in pending:
+                yield _analyze_range(item, session, hunks)
+        finally:
+            session.close()
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(hunks,)) as pool:
+        futures = [pool.submit(_analyze_in_worker, item, hunks) for item in pending]
+        for future in as_completed(futures):
+            yield future.result()
+
+def _analyze_range(item: Dict[str, Any], session: BatchSession, hunks: bool) -> Dict[str, Any]:
+    base_branch = item["range"].split("..", 1)[0]
+    analyzer = ChangeAnalyzer(
+        base_branch, hunks=hunks, head=item["head"], session=session, trees=item["trees"]
+    )
+    try:
+        analysis = analyzer.analyze()
+    except (subprocess.CalledProcessError, OSError) as e:
+        return {"range": item["range"], "error": str(e)}
+    return {"range": item["range"], "base": item["base"], "head": item["head"], **analysis}
+
+def _add_impacted_tests(result: Dict[str, Any], graph: DependencyGraph):
+    """Add impacted tests to a batch result, with the index moved to its head."""
+    trivial = {file_path for file_path, info in result["files"].items() if info.get("trivial")}
+    analyzer = ChangeAnalyzer(impact=True, head=result["head"], graph=graph)
+    analyzer.changed_files = result["changed_files"]
+    analyzer.trivial_files = trivial
+    analyzer.analysis = result
+    analyzer._find_impacted_tests()
+
+# Per-process batch session (worker processes)
+_session: Optional[BatchSession] = None
+
+def _init_worker(hunks: bool):
+    global _session
+    _session = BatchSession(hunks)
+
+def _analyze_in_worker(item: Dict[str, Any], hunks: bool) -> Dict[str, Any]:
+    return _analyze_range(item, _session, hunks)
+
+def _git(*args: str) -> str:
+    result = subprocess.run(["git", *args], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+def categorize_path(path: str) -> str:
+    """Category of one file: test, backend, frontend, database or other."""
+    return _category(CLASSIFIER.classify(path))
+
+def _category(tags: List[str]) -> str:
+    """First matching category in precedence order."""
+    for category in CATEGORY_PATTERNS:
+        if category in tags:
+            return category
+    return "other"
 
 def main():
-    base_branch = sys.argv[1] if len(sys.argv) > 1 else "main"
+    parser = argparse.ArgumentParser(description="Analyze git changes for test planning")
+    parser.add_argument("base_branch", nargs="?", default="main", help="Base branch (default: main)")
+    parser.add_argument("--impact", action="store_true",
+                        help="List test files that transitively import the changed files")
+    parser.add_argument("--cache", help="Dependency index file used by --impact")
+    parser.add_argument("--hunks", action="store_true",
+                        help="Report changed line ranges and touched symbols; ignore comment-only changes")
+    parser.add_argument("--batch", metavar="FILE",
+                        help='File of "base...head" or "base..head" ranges, one per line ("-" for stdin); prints JSON Lines')
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for --batch (default: 1)")
+
+    args = parser.parse_args()
+
+    if args.batch:
+        if args.batch == "-":
+            specs = [line.strip() for line in sys.stdin if line.strip()]
+        else:
+            batch_path = Path(args.batch)
+            if not batch_path.exists():
+                print(f"Error: File not found: {batch_path}", file=sys.stderr)
+                sys.exit(1)
+            specs = [line.strip() for line in batch_path.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+        failed = False
+        for result in analyze_batch(resolve_ranges(specs), args.jobs, args.hunks, args.impact, args.cache):
+            failed |= "error" in result
+            print(json.dumps(result), flush=True)
+        sys.exit(1 if failed else 0)
 
-    analyzer = ChangeAnalyzer(base_branch)
+    analyzer = ChangeAnalyzer(args.base_branch, impact=args.impact, cache_path=args.cache, hunks=args.hunks)
     analysis = analyzer.analyze()
 
     # Output as JSON
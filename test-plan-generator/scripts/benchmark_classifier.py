@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Path Classifier Benchmark
+
+Compares the compiled single-pass PathClassifier used by analyze_changes.py
+with the previous approach (re.search over each pattern list, one pass over
+the changed files per recommendation signal), and with that approach
+extended to per-file tags, and checks all of them agree.
+
+Usage:
+    python benchmark_classifier.py
+    python benchmark_classifier.py --files 100000
+    git ls-files > paths.txt && python benchmark_classifier.py --paths paths.txt
+
+Output: JSON with timings and speedup
+"""
+
+import sys
+import re
+import json
+import time
+import random
+import argparse
+from typing import Dict, List, Any
+from pathlib import Path
+
+from analyze_changes import CATEGORY_PATTERNS, SIGNAL_PATTERNS, CLASSIFIER, _category
+
+# Path fragments used to build synthetic diffs (vendored bumps, mass renames)
+DIRECTORIES = [
+    "src", "src/api", "src/components", "src/pages", "src/services", "backend/Controllers",
+    "server/routes", "frontend/views", "tests", "db/migrations", "Domain/Entities", "node_modules/lib",
+    "vendor/github.com/org/pkg", "internal/cache", "Integration/Clients"
+]
+NAMES = [
+    "UserController.cs", "OrderService.cs", "index.tsx", "Button.jsx", "styles.scss", "main.py", "app.py",
+    "handler.go", "handler_test.go", "test_orders.py", "schema.sql", "QueryHelper.ts", "README.md",
+    "ApiClient.cs", "PaymentValidator.cs", "cache.go", "Orders.spec.ts", "OrderServiceTests.cs"
+]
+
+def synthetic_paths(count: int, seed: int = 0) -> List[str]:
+    generator = random.Random(seed)
+    return [
+        f"{generator.choice(DIRECTORIES)}/m{i % 997}/{generator.choice(NAMES)}"
+        for i in range(count)
+    ]
+
+def _matches(patterns: List[str], path: str) -> bool:
+    return any(re.search(pattern, path, re.IGNORECASE) for pattern in patterns)
+
+def classify_legacy(paths: List[str]) -> Dict[str, Any]:
+    """Per-pattern re.search loops, one pass over the files per signal."""
+    counts = {category: 0 for category in CATEGORY_PATTERNS}
+    for path in paths:
+        for category, patterns in CATEGORY_PATTERNS.items():
+            if _matches(patterns, path):
+                counts[category] += 1
+                break
+    signals = {
+        signal for signal, patterns in SIGNAL_PATTERNS.items()
+        if any(_matches(patterns, path) for path in paths)
+    }
+    return {"counts": counts, "signals": sorted(signals)}
+
+def tag_legacy(paths: List[str]) -> List[List[str]]:
+    """Per-file tags computed with per-pattern re.search loops."""
+    tables = {**CATEGORY_PATTERNS, **SIGNAL_PATTERNS}
+    return [[tag for tag, patterns in tables.items() if _matches(patterns, path)] for path in paths]
+
+def classify_compiled(paths: List[str]) -> Dict[str, Any]:
+    """Single pass with the compiled classifier, keeping per-file tags."""
+    counts = {category: 0 for category in CATEGORY_PATTERNS}
+    signals = set()
+    tags = []
+    for path in paths:
+        path_tags = CLASSIFIER.classify(path)
+        category = _category(path_tags)
+        if category != "other":
+            counts[category] += 1
+        signals.update(path_tags)
+        tags.append(path_tags)
+    return {"counts": counts, "signals": sorted(signals & set(SIGNAL_PATTERNS)), "tags": tags}
+
+def _timed(function, paths: List[str], repeat: int) -> tuple:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(paths)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analyze_changes.py path classifier")
+    parser.add_argument("--files", type=int, default=50000, help="Synthetic changed paths (default: 50000)")
+    parser.add_argument("--paths", help="File with one path per line instead of synthetic paths")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per approach, best kept (default: 3)")
+
+    args = parser.parse_args()
+
+    if args.paths:
+        paths_file = Path(args.paths)
+        if not paths_file.exists():
+            print(f"Error: File not found: {paths_file}", file=sys.stderr)
+            sys.exit(1)
+        paths = [line for line in paths_file.read_text(encoding='utf-8').splitlines() if line]
+    else:
+        paths = synthetic_paths(args.files)
+
+    legacy, legacy_time = _timed(classify_legacy, paths, args.repeat)
+    legacy_tags, legacy_tags_time = _timed(tag_legacy, paths, args.repeat)
+    compiled, compiled_time = _timed(classify_compiled, paths, args.repeat)
+
+    tags = compiled.pop("tags")
+    if legacy != compiled or legacy_tags != tags:
+        print("Error: compiled classifier disagrees with the pattern loops", file=sys.stderr)
+        sys.exit(1)
+
+    # Output as JSON
+    print(json.dumps({
+        "paths": len(paths),
+        "legacy_seconds": round(legacy_time, 4),
+        "legacy_per_file_tags_seconds": round(legacy_tags_time, 4),
+        "compiled_seconds": round(compiled_time, 4),
+        "speedup": round(legacy_time / compiled_time, 2) if compiled_time else None,
+        "speedup_per_file_tags": round(legacy_tags_time / compiled_time, 2) if compiled_time else None,
+        "result": compiled
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+Source Dependency Graph
+
+Builds a reverse dependency graph from source imports so changed files can
+be mapped to the test files they may affect. Used by analyze_changes.py
+(--impact).
+
+Supported languages:
+- Python: import / from ... import (including relative imports)
+- TypeScript/JavaScript: import, export ... from, require(), import()
+  (relative specifiers only)
+- Go: imports of packages inside the repository (module path from go.mod),
+  plus files of the same package
+- C#: using directives, resolved through namespace declarations
+
+The graph is kept in an on-disk SQLite index of a commit's tree (default
+HEAD): per file its blob SHA, extracted imports, category and symbols, plus
+the resolved dependencies. Only blobs that changed since the indexed tree
+(git diff-tree) are read again, through a single git cat-file --batch
+process, and queries touch only the files they need, so warm runs stay fast
+on large repositories.
+"""
+
+import re
+import json
+import sqlite3
+import posixpath
+import subprocess
+from typing import Callable, Dict, List, Optional, Set, Iterable, Tuple, Any
+from pathlib import Path
+
+INDEX_VERSION = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    sha TEXT NOT NULL,
+    category TEXT,
+    imports TEXT NOT NULL,
+    declares TEXT NOT NULL,
+    symbols TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dependencies (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS modules (
+    key TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS import_keys (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dependencies_by_source ON dependencies(source);
+CREATE INDEX IF NOT EXISTS dependencies_by_target ON dependencies(target);
+CREATE INDEX IF NOT EXISTS modules_by_key ON modules(key);
+CREATE INDEX IF NOT EXISTS modules_by_path ON modules(path);
+CREATE INDEX IF NOT EXISTS import_keys_by_key ON import_keys(key);
+CREATE INDEX IF NOT EXISTS import_keys_by_source ON import_keys(source);
+"""
+
+# Host parameters per IN (...) query
+SQL_BATCH_SIZE = 500
+
+# Sources resolved at once above which the module table is loaded in memory
+FULL_LOOKUP_SOURCES = 1000
+
+# Blobs larger than this (bundles, generated code) are indexed without content
+MAX_BLOB_BYTES = 2 * 1024 * 1024
+
+# git tree entry modes of regular files
+FILE_MODES = ("100644", "100755")
+
+LANGUAGES = {
+    ".py": "python",
+    ".ts": "javascript",
+    ".tsx": "javascript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".go": "go",
+    ".cs": "csharp"
+}
+
+# Extensions tried when resolving a relative JS/TS specifier
+JS_RESOLVE_SUFFIXES = [
+    "", ".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs",
+    "/index.ts", "/index.tsx", "/index.js", "/index.jsx"
+]
+
+PY_IMPORT_RE = re.compile(r'^[ \t]*import[ \t]+([\w.]+(?:[ \t]*,[ \t]*[\w.]+)*)', re.MULTILINE)
+PY_FROM_RE = re.compile(r'^[ \t]*from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+(?:\(([^)]*)\)|([^\n#;]+))', re.MULTILINE)
+JS_IMPORT_RE = re.compile(r'''(?:\bfrom|\bimport|\brequire)\s*\(?\s*['"]([^'"\n]+)['"]''')
+GO_IMPORT_BLOCK_RE = re.compile(r'^import\s*\((.*?)\)', re.MULTILINE | re.DOTALL)
+GO_IMPORT_LINE_RE = re.compile(r'^import\s+(?:[\w.]+\s+)?"([^"]+)"', re.MULTILINE)
+GO_IMPORT_SPEC_RE = re.compile(r'"([^"]+)"')
+GO_MODULE_RE = re.compile(r'^module\s+(\S+)', re.MULTILINE)
+CS_USING_RE = re.compile(r'^\s*(?:global\s+)?using\s+(?:static\s+)?(?:\w+\s*=\s*)?([\w.]+)\s*;', re.MULTILINE)
+CS_NAMESPACE_RE = re.compile(r'^\s*namespace\s+([\w.]+)', re.MULTILINE)
+
+# Symbol declarations per language: (kind group, name group)
+SYMBOL_RES = {
+    "python": re.compile(r'^[ \t]*(?:async[ \t]+)?(def|class)[ \t]+(\w+)', re.MULTILINE),
+    "javascript": re.compile(
+        r'^[ \t]*(?:export[ \t]+)?(?:default[ \t]+)?(?:async[ \t]+)?'
+        r'(function|class|interface|const|let)\*?[ \t]+(\w+)(?=[^\n]*(?:=>|\{|\())',
+        re.MULTILINE
+    ),
+    "go": re.compile(r'^(func|type)[ \t]+(?:\([^)]*\)[ \t]*)?(\w+)', re.MULTILINE),
+    "csharp": re.compile(
+        r'^[ \t]*(?:(?:public|private|protected|internal|static|sealed|abstract|partial|async|'
+        r'virtual|override|readonly)[ \t]+)*(class|interface|record|struct|enum)[ \t]+(\w+)',
+        re.MULTILINE
+    )
+}
+CS_METHOD_RE = re.compile(
+    r'^[ \t]*(?:(?:public|private|protected|internal|static|async|virtual|override)[ \t]+)+'
+    r'[\w<>\[\],.? ]+?[ \t]+(\w+)[ \t]*\(',
+    re.MULTILINE
+)
+
+def extract_imports(path: str, text: str) -> Dict[str, List[str]]:
+    """Extract raw import targets (and C# namespace declarations) from a source file."""
+    language = LANGUAGES.get(posixpath.splitext(path)[1])
+    imports: List[str] = []
+    declares: List[str] = []
+
+    if language == "python":
+        for match in PY_IMPORT_RE.finditer(text):
+            imports.extend(name.strip() for name in match.group(1).split(","))
+        for match in PY_FROM_RE.finditer(text):
+            module = _absolute_python_module(path, match.group(1))
+            if module:
+                imports.append(module)
+            # "from pkg import mod" may import a submodule
+            names = re.sub(r'\s+as\s+\w+', '', match.group(2) or match.group(3))
+            for name in re.split(r'[\s,]+', names):
+                if name and name != "*" and "." not in name:
+                    imports.append(f"{module}.{name}" if module else name)
+    elif language == "javascript":
+        imports = [spec for spec in JS_IMPORT_RE.findall(text) if spec.startswith(".")]
+    elif language == "go":
+        for block in GO_IMPORT_BLOCK_RE.findall(text):
+            imports.extend(GO_IMPORT_SPEC_RE.findall(block))
+        imports.extend(GO_IMPORT_LINE_RE.findall(text))
+    elif language == "csharp":
+        imports = CS_USING_RE.findall(text)
+        declares = CS_NAMESPACE_RE.findall(text)
+
+    return {"imports": sorted(set(imports)), "declares": declares}
+
+def extract_symbols(path: str, text: str) -> List[List[Any]]:
+    """Declared classes/functions as [kind, name, line, indent], in file order."""
+    language = LANGUAGES.get(posixpath.splitext(path)[1])
+    pattern = SYMBOL_RES.get(language)
+    if not pattern:
+        return []
+    matches = [(m.start(), m.group(1), m.group(2), _indent(m.group(0))) for m in pattern.finditer(text)]
+    if language == "csharp":
+        declared = {start for start, kind, name, indent in matches}
+        matches.extend(
+            (m.start(), "method", m.group(1), _indent(m.group(0)))
+            for m in CS_METHOD_RE.finditer(text) if m.start() not in declared
+        )
+        matches.sort()
+    symbols = []
+    line, position = 1, 0
+    for start, kind, name, indent in matches:
+        line += text.count("\n", position, start)
+        position = start
+        symbols.append([kind, name, line, indent])
+    return symbols
+
+def _indent(declaration: str) -> int:
+    return len(declaration) - len(declaration.lstrip(" \t"))
+
+def _absolute_python_module(path: str, module: str) -> str:
+    """Turn a (possibly relative) "from" module into a dotted path from the repo root."""
+    level = len(module) - len(module.lstrip("."))
+    if level == 0:
+        return module
+    package = posixpath.dirname(path).split("/") if posixpath.dirname(path) else []
+    if level > 1:
+        package = package[:len(package) - (level - 1)]
+    rest = module[level:]
+    return ".".join(package + ([rest] if rest else []))
+
+class GitBlobReader:
+    """Reads blobs through one long-lived git cat-file --batch process."""
+
+    def __init__(self, root: str = "."):
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+
+    def read(self, sha: str) -> Optional[bytes]:
+        """Content of a blob, or None if it is missing."""
+        self.process.stdin.write(sha.encode() + b"\n")
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().split()
+        if len(header) < 3 or header[1] == b"missing":
+            return None
+        content = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)  # trailing newline
+        return content
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+class DependencyGraph:
+    def __init__(self, root: str = ".", cache_path: Optional[str] = None,
+                 categorize: Optional[Callable[[str], str]] = None, tree: str = "HEAD"):
+        self.root = Path(root)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.categorize = categorize
+        self.tree = tree
+        # Files (re)indexed by the last build
+        self.updated = 0
+        if self.cache_path:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.cache_path) if self.cache_path else ":memory:")
+        self._open_index()
+
+    def close(self):
+        self.conn.close()
+
+    def build(self) -> "DependencyGraph":
+        """Bring the index up to date with the tree and resolve imports to files."""
+        tree_sha = self._git("rev-parse", f"{self.tree}^{{tree}}").strip()
+        indexed_tree = self._meta("tree")
+        if indexed_tree == tree_sha:
+            return self
+
+        changes = self._tree_changes(indexed_tree, tree_sha) if indexed_tree else None
+        cold = changes is None
+        indexed: Dict[str, str] = {}
+        old_keys: Dict[str, Set[str]] = {}
+        if cold:
+            # Cold run (or the indexed tree is gone): list the whole tree
+            changes = self._tree_files(tree_sha)
+        else:
+            paths = [file_path for file_path, sha in changes]
+            indexed = dict(self._select("SELECT path, sha FROM files WHERE path IN ({})", paths))
+            for key, file_path in self._select("SELECT key, path FROM modules WHERE path IN ({})", paths):
+                old_keys.setdefault(file_path, set()).add(key)
+
+        updated: List[str] = []
+        removed: List[str] = []
+        rows = []
+        module_rows = []
+        # Module keys that appeared or disappeared: imports looking them up must be re-resolved
+        changed_keys: Set[str] = set()
+        reader = GitBlobReader(str(self.root))
+        try:
+            for file_path, sha in changes:
+                if sha is None:
+                    if file_path in indexed:
+                        removed.append(file_path)
+                        changed_keys |= old_keys.get(file_path, set())
+                elif indexed.get(file_path) != sha:
+                    entry = self._extract(file_path, sha, reader)
+                    rows.append((
+                        file_path, sha, entry.get("category"), json.dumps(entry["imports"]),
+                        json.dumps(entry["declares"]), json.dumps(entry["symbols"])
+                    ))
+                    keys = set(_module_keys(file_path, entry["declares"]))
+                    changed_keys |= keys ^ old_keys.get(file_path, set())
+                    module_rows.extend((key, file_path) for key in keys)
+                    updated.append(file_path)
+        finally:
+            reader.close()
+
+        with self.conn:
+            if cold:
+                for table in ("files", "modules", "import_keys", "dependencies"):
+                    self.conn.execute(f"DELETE FROM {table}")
+            else:
+                stale = removed + updated
+                self._delete("DELETE FROM files WHERE path IN ({})", removed)
+                self._delete("DELETE FROM modules WHERE path IN ({})", stale)
+                self._delete("DELETE FROM import_keys WHERE source IN ({})", stale)
+                self._delete("DELETE FROM dependencies WHERE source IN ({})", stale)
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.conn.executemany("INSERT INTO modules VALUES (?, ?)", module_rows)
+
+            if cold or any(key.startswith("gomod:") for key in changed_keys):
+                # Go module paths changed: every Go import may resolve differently
+                if not cold:
+                    self.conn.execute("DELETE FROM import_keys")
+                    self.conn.execute("DELETE FROM dependencies")
+                sources = [file_path for (file_path,) in self.conn.execute("SELECT path FROM files")]
+            else:
+                affected = self._select(
+                    "SELECT DISTINCT source FROM import_keys WHERE key IN ({})", sorted(changed_keys)
+                )
+                sources = sorted(set(updated) | {source for (source,) in affected})
+                self._delete("DELETE FROM import_keys WHERE source IN ({})", sources)
+                self._delete("DELETE FROM dependencies WHERE source IN ({})", sources)
+            self._resolve(sources)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('tree', ?)", (tree_sha,))
+
+        self.updated = len(updated)
+        return self
+
+    def impacted(self, changed: Iterable[str]) -> Set[str]:
+        """All files that transitively import any of the changed files (including them)."""
+        seen = set(changed)
+        frontier = list(seen)
+        while frontier:
+            dependents = self._select("SELECT DISTINCT source FROM dependencies WHERE target IN ({})", frontier)
+            frontier = [source for (source,) in dependents if source not in seen]
+            seen.update(frontier)
+        return seen
+
+    def dependencies(self, file_path: str) -> List[str]:
+        """Files imported by a file."""
+        return [target for (target,) in self.conn.execute(
+            "SELECT target FROM dependencies WHERE source = ? ORDER BY target", (file_path,)
+        )]
+
+    def entry(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Index entry of a file (blob SHA, category, imports, declares, symbols), if indexed."""
+        row = self.conn.execute(
+            "SELECT sha, category, imports, declares, symbols FROM files WHERE path = ?", (file_path,)
+        ).fetchone()
+        if row is None:
+            return None
+        sha, category, imports, declares, symbols = row
+        return {
+            "sha": sha,
+            "category": category,
+            "imports": json.loads(imports),
+            "declares": json.loads(declares),
+            "symbols": json.loads(symbols)
+        }
+
+    def categories(self, files: Iterable[str]) -> Dict[str, str]:
+        """Indexed category of each of the files present in the tree."""
+        return dict(self._select("SELECT path, category FROM files WHERE path IN ({})", list(files)))
+
+    def file_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def _open_index(self):
+        """Create the index tables, discarding an index of another version."""
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        signature = f"{INDEX_VERSION}:{int(bool(self.categorize))}"
+        if self._meta("version") != signature:
+            with self.conn:
+                for table in ("files", "modules", "import_keys", "dependencies"):
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self.conn.execute("DELETE FROM meta")
+                self.conn.execute("INSERT INTO meta VALUES ('version', ?)", (signature,))
+        self.conn.executescript(SCHEMA)
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _select(self, query: str, values: List[str]) -> List[tuple]:
+        """Run a query with an IN ({}) placeholder list, in batches."""
+        rows: List[tuple] = []
+        for start in range(0, len(values), SQL_BATCH_SIZE):
+            batch = values[start:start + SQL_BATCH_SIZE]
+            rows.extend(self.conn.execute(query.format(",".join("?" * len(batch))), batch))
+        return rows
+
+    def _delete(self, query: str, values: List[str]):
+        for start in range(0, len(values), SQL_BATCH_SIZE):
+            batch = values[start:start + SQL_BATCH_SIZE]
+            self.conn.execute(query.format(",".join("?" * len(batch))), batch)
+
+    def _git(self, *args: str) -> str:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=self.root,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout
+
+    def _tree_files(self, tree_sha: str) -> List[Tuple[str, Optional[str]]]:
+        """All regular files of a tree as (path, blob SHA)."""
+        files = []
+        for record in self._git("ls-tree", "-r", "-z", "--full-tree", tree_sha).split("\0"):
+            if not record:
+                continue
+            info, file_path = record.split("\t", 1)
+            mode, kind, sha = info.split()
+            if mode in FILE_MODES:
+                files.append((file_path, sha))
+        return files
+
+    def _tree_changes(self, old_tree: str, new_tree: str) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """Files changed between two trees as (path, new blob SHA or None if removed)."""
+        try:
+            output = self._git("diff-tree", "-r", "-z", "--no-renames", old_tree, new_tree)
+        except subprocess.CalledProcessError:
+            return None
+        fields = output.split("\0")
+        changes = []
+        for i in range(0, len(fields) - 1, 2):
+            old_mode, new_mode, old_sha, new_sha, status = fields[i].lstrip(":").split()
+            removed = status == "D" or new_mode not in FILE_MODES
+            changes.append((fields[i + 1], None if removed else new_sha))
+        return changes
+
+    def _extract(self, file_path: str, sha: str, reader: GitBlobReader) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {"imports": [], "declares": [], "symbols": []}
+        if self.categorize:
+            entry["category"] = self.categorize(file_path)
+
+        is_go_mod = posixpath.basename(file_path) == "go.mod"
+        if not is_go_mod and posixpath.splitext(file_path)[1] not in LANGUAGES:
+            return entry
+        content = reader.read(sha)
+        if content is None or len(content) > MAX_BLOB_BYTES:
+            return entry
+
+        text = content.decode('utf-8', errors='replace')
+        if is_go_mod:
+            match = GO_MODULE_RE.search(text)
+            entry["declares"] = [match.group(1)] if match else []
+        else:
+            entry.update(extract_imports(file_path, text))
+            entry["symbols"] = extract_symbols(file_path, text)
+        return entry
+
+    def _resolve(self, sources: List[str]):
+        """Resolve the raw imports of sources to repository files and store the edges.
+
+        The module keys each source looked up are stored too, so a later
+        build can find the sources affected by files appearing or vanishing.
+        """
+        sources = [f for f in sources if posixpath.splitext(f)[1] in LANGUAGES]
+        if not sources:
+            return
+        go_modules = {
+            key[len("gomod:"):]: posixpath.dirname(file_path)
+            for key, file_path in self.conn.execute("SELECT key, path FROM modules WHERE key LIKE 'gomod:%'")
+        }
+        if len(sources) > FULL_LOOKUP_SOURCES:
+            # Many sources: one scan of the module table beats a query per key
+            modules: Dict[str, List[str]] = {}
+            for key, file_path in self.conn.execute("SELECT key, path FROM modules"):
+                modules.setdefault(key, []).append(file_path)
+            lookup = lambda key: modules.get(key, [])
+        else:
+            lookup = self._lookup_module
+
+        edges = []
+        lookups = []
+        for file_path, imports in self._select("SELECT path, imports FROM files WHERE path IN ({})", sources):
+            language = LANGUAGES[posixpath.splitext(file_path)[1]]
+            keys: List[str] = []
+            targets: Set[str] = set()
+            if language == "python":
+                for module in json.loads(imports):
+                    keys.append(f"py:{module}")
+                    targets.update(_closest(file_path, lookup(keys[-1])))
+            elif language == "javascript":
+                base = posixpath.dirname(file_path)
+                for spec in json.loads(imports):
+                    target = posixpath.normpath(posixpath.join(base, spec))
+                    for suffix in JS_RESOLVE_SUFFIXES:
+                        keys.append(f"js:{target}{suffix}")
+                        if lookup(keys[-1]):
+                            targets.add(target + suffix)
+                            break
+            elif language == "go":
+                # Files of a package see each other without imports
+                keys.append(f"go:{posixpath.dirname(file_path)}")
+                for spec in json.loads(imports):
+                    for module, module_dir in go_modules.items():
+                        if spec == module or spec.startswith(module + "/"):
+                            package_dir = posixpath.normpath(posixpath.join(module_dir, spec[len(module) + 1:]))
+                            keys.append(f"go:{package_dir}")
+                for key in keys:
+                    targets.update(lookup(key))
+            elif language == "csharp":
+                for namespace in json.loads(imports):
+                    keys.append(f"cs:{namespace}")
+                    targets.update(lookup(keys[-1]))
+
+            targets.discard(file_path)
+            edges.extend((file_path, target) for target in targets)
+            lookups.extend((file_path, key) for key in set(keys))
+
+        self.conn.executemany("INSERT INTO dependencies VALUES (?, ?)", edges)
+        self.conn.executemany("INSERT INTO import_keys VALUES (?, ?)", lookups)
+
+    def _lookup_module(self, key: str) -> List[str]:
+        return [file_path for (file_path,) in self.conn.execute("SELECT path FROM modules WHERE key = ?", (key,))]
+
+def _module_keys(file_path: str, declares: List[str]) -> List[str]:
+    """Keys under which imports find a file: dotted Python names, JS paths, Go package dirs, C# namespaces."""
+    name, extension = posixpath.splitext(file_path)
+    language = LANGUAGES.get(extension)
+    if language is None:
+        if posixpath.basename(file_path) == "go.mod":
+            return [f"gomod:{module}" for module in declares]
+        return []
+    if language == "python":
+        parts = name.split("/")
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        # Every dotted suffix, to support src/ layouts
+        return [f"py:{'.'.join(parts[i:])}" for i in range(len(parts))]
+    if language == "javascript":
+        return [f"js:{file_path}"]
+    if language == "go":
+        return [] if file_path.endswith("_test.go") else [f"go:{posixpath.dirname(file_path)}"]
+    return [f"cs:{namespace}" for namespace in declares]
+
+def _closest(importer: str, candidates: List[str]) -> List[str]:
+    """Among several modules with the same dotted name, prefer those in the importer's top-level directory."""
+    if len(candidates) <= 1:
+        return candidates
+    top = importer.split("/", 1)[0]
+    same_root = [c for c in candidates if c.split("/", 1)[0] == top]
+    return same_root or candidates
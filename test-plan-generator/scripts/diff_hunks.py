@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Streaming Diff Hunks
+
+Parses `git diff -U0` output line by line and yields, per changed file, the
+changed line ranges (new side) and whether every changed line is blank or a
+comment. Patch content is never kept, so memory stays bounded by the hunk
+ranges of one file, whatever the size of the diff. Used by
+analyze_changes.py (--hunks, and --batch through long-lived diff-tree pipes).
+"""
+
+import re
+import bisect
+import codecs
+import posixpath
+import subprocess
+from typing import Dict, List, Optional, Iterable, Iterator, Any
+
+# git's well-known empty tree, used as the diff-tree --stdin response sentinel
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+HUNK_RE = re.compile(rb'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+# Changed lines that do not change behavior, by file extension
+HASH_COMMENT_RE = re.compile(rb'\s*(?:#|$)')
+SLASH_COMMENT_RE = re.compile(rb'\s*(?://|/\*|\*|$)')
+SQL_COMMENT_RE = re.compile(rb'\s*(?:--|$)')
+MARKUP_COMMENT_RE = re.compile(rb'\s*(?:<!--|$)')
+BLANK_RE = re.compile(rb'\s*$')
+COMMENT_RES = {
+    ".py": HASH_COMMENT_RE,
+    ".rb": HASH_COMMENT_RE,
+    ".sh": HASH_COMMENT_RE,
+    ".yml": HASH_COMMENT_RE,
+    ".yaml": HASH_COMMENT_RE,
+    ".toml": HASH_COMMENT_RE,
+    ".cs": SLASH_COMMENT_RE,
+    ".go": SLASH_COMMENT_RE,
+    ".ts": SLASH_COMMENT_RE,
+    ".tsx": SLASH_COMMENT_RE,
+    ".js": SLASH_COMMENT_RE,
+    ".jsx": SLASH_COMMENT_RE,
+    ".mjs": SLASH_COMMENT_RE,
+    ".cjs": SLASH_COMMENT_RE,
+    ".java": SLASH_COMMENT_RE,
+    ".kt": SLASH_COMMENT_RE,
+    ".rs": SLASH_COMMENT_RE,
+    ".css": SLASH_COMMENT_RE,
+    ".scss": SLASH_COMMENT_RE,
+    ".less": SLASH_COMMENT_RE,
+    ".sql": SQL_COMMENT_RE,
+    ".html": MARKUP_COMMENT_RE,
+    ".vue": MARKUP_COMMENT_RE,
+    ".svelte": MARKUP_COMMENT_RE
+}
+
+class FileHunks:
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        # Changed line ranges on the new side, [start, end], merged and in order
+        self.ranges: List[List[int]] = []
+        self.added = 0
+        self.removed = 0
+        # Set once a changed line is neither blank nor a comment
+        self.substantive = False
+        self.comment_re = _comment_re(path)
+
+    @property
+    def trivial(self) -> bool:
+        """True if the file has hunks and all changed lines are blank or comments."""
+        return bool(self.ranges) and not self.substantive
+
+    def add_range(self, start: int, end: int):
+        if self.ranges and start <= self.ranges[-1][1] + 1:
+            self.ranges[-1][1] = max(self.ranges[-1][1], end)
+        else:
+            self.ranges.append([start, end])
+
+    def set_path(self, path: str):
+        self.path = path
+        self.comment_re = _comment_re(path)
+
+def iter_file_hunks(lines: Iterable[bytes]) -> Iterator[FileHunks]:
+    """Yield the hunks of each file of a -U0 patch as soon as the file ends."""
+    current: Optional[FileHunks] = None
+    old_left = new_left = 0
+
+    for line in lines:
+        if old_left > 0 or new_left > 0:
+            # Hunk body: counts tell content from headers ("--- x" can be a removed line)
+            marker = line[:1]
+            if marker == b"-":
+                old_left -= 1
+                current.removed += 1
+            elif marker == b"+":
+                new_left -= 1
+                current.added += 1
+            else:
+                continue
+            if not current.substantive and not current.comment_re.match(line, 1):
+                current.substantive = True
+            continue
+
+        if line.startswith(b"diff --git "):
+            if current is not None:
+                yield current
+            current = FileHunks(_path_from_diff_line(line))
+        elif current is None:
+            continue
+        elif line.startswith(b"+++ "):
+            path = _header_path(line)
+            if path is not None:
+                current.set_path(path)
+        elif line.startswith(b"--- ") and current.path is None:
+            path = _header_path(line)
+            if path is not None:
+                current.set_path(path)
+        elif line.startswith(b"@@"):
+            match = HUNK_RE.match(line)
+            if not match:
+                continue
+            old_left = int(match.group(2)) if match.group(2) is not None else 1
+            new_start = int(match.group(3))
+            new_left = int(match.group(4)) if match.group(4) is not None else 1
+            if new_left:
+                current.add_range(new_start, new_start + new_left - 1)
+            else:
+                # Pure deletion: attribute it to the line before it
+                current.add_range(max(new_start, 1), max(new_start, 1))
+
+    if current is not None:
+        yield current
+
+def stream_diff(diff_range: str, cwd: Optional[str] = None) -> Iterator[FileHunks]:
+    """Run git diff -U0 on a range and yield per-file hunks while it streams."""
+    process = subprocess.Popen(
+        ["git", "-c", "core.quotePath=false", "diff", "-U0", "--no-color", "--no-ext-diff", diff_range],
+        cwd=cwd,
+        stdout=subprocess.PIPE
+    )
+    try:
+        yield from iter_file_hunks(process.stdout)
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, process.args)
+
+class DiffTreePipe:
+    """Diffs tree pairs through one long-lived git diff-tree --stdin process.
+
+    Each request is followed by a sentinel pair (the empty tree against
+    itself, which git echoes with no diff) and a blank line, which makes
+    git flush; the response is everything between the echoed request and
+    the echoed sentinel.
+    """
+
+    def __init__(self, cwd: Optional[str] = None, patch: bool = False):
+        args = ["git", "-c", "core.quotePath=false", "diff-tree", "--stdin", "-r", "--no-color", "--no-ext-diff"]
+        args += ["-p", "-U0"] if patch else ["--name-only"]
+        self.process = subprocess.Popen(args, cwd=cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def lines(self, old_tree: str, new_tree: str) -> Iterator[bytes]:
+        """Output lines for one tree pair; must be consumed before the next request."""
+        if old_tree == new_tree:
+            return
+        self.process.stdin.write(f"{old_tree} {new_tree}\n{EMPTY_TREE} {EMPTY_TREE}\n\n".encode())
+        self.process.stdin.flush()
+        header = b""
+        while not header.strip():
+            header = self.process.stdout.readline()
+            if not header:
+                raise subprocess.CalledProcessError(self.process.wait(), self.process.args)
+        sentinel = f"{EMPTY_TREE} {EMPTY_TREE}".encode()
+        for line in iter(self.process.stdout.readline, b""):
+            if line.startswith(sentinel):
+                return
+            yield line
+        raise subprocess.CalledProcessError(self.process.wait(), self.process.args)
+
+    def changed_files(self, old_tree: str, new_tree: str) -> List[str]:
+        """Changed paths between two trees (name-only pipes)."""
+        return [_unquote(line.rstrip(b"\r\n")) for line in self.lines(old_tree, new_tree)]
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+def touched_symbols(symbols: List[List[Any]], ranges: List[List[int]]) -> List[str]:
+    """Qualified names of the symbols that own the changed lines.
+
+    A line belongs to the last symbol declared at or before it; nesting (for
+    qualified names like Class.method) follows declaration indentation. Lines
+    before the first symbol are reported as "<top-level>".
+    """
+    names = []
+    starts = []
+    stack: List[tuple] = []  # (indent, qualified name)
+    for kind, name, line, indent in symbols:
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        qualified = f"{stack[-1][1]}.{name}" if stack else name
+        stack.append((indent, qualified))
+        names.append(qualified)
+        starts.append(line)
+
+    touched: Dict[str, None] = {}
+    for start, end in ranges:
+        owner = bisect.bisect_right(starts, start) - 1
+        touched[names[owner] if owner >= 0 else "<top-level>"] = None
+        # Symbols declared inside the range
+        for index in range(owner + 1, bisect.bisect_right(starts, end)):
+            touched[names[index]] = None
+    return list(touched)
+
+def _comment_re(path: Optional[str]):
+    return COMMENT_RES.get(posixpath.splitext(path)[1].lower(), BLANK_RE) if path else BLANK_RE
+
+def _header_path(line: bytes) -> Optional[str]:
+    """Path of a ---/+++ header, None for /dev/null."""
+    path = _unquote(line[4:].rstrip(b"\r\n"))
+    if path == "/dev/null":
+        return None
+    return path[2:] if path.startswith(("a/", "b/")) else path
+
+def _path_from_diff_line(line: bytes) -> Optional[str]:
+    """New path from "diff --git a/x b/x" (used for files without ---/+++ headers)."""
+    rest = line[len(b"diff --git "):].rstrip(b"\r\n")
+    if rest.startswith(b'"'):
+        return None
+    separator = rest.find(b" b/")
+    return _unquote(rest[separator + 3:]) if separator >= 0 else None
+
+def _unquote(path: bytes) -> str:
+    """Decode a path, undoing git's C-style quoting."""
+    if path.startswith(b'"') and path.endswith(b'"'):
+        path = codecs.escape_decode(path[1:-1])[0]
+    return path.decode('utf-8', errors='replace')